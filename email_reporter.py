@@ -3,137 +3,322 @@ Email Reporter Tool
 Sends formatted email reports with stock data
 """
 
+import logging
+import queue
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from typing import Dict, List
+import threading
+import time
+from email.message import EmailMessage
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
+
+# HTML templates are built once at import; only the fields are filled per report
+_ROW_TMPL = (
+    '<tr><td><strong>{symbol}</strong><br><small class="name">{name}</small></td>'
+    '<td class="num"><strong>${price}</strong></td>'
+    '<td class="num {direction}">{arrow} ${abs_change}<br><small>({change_percent:+.2f}%)</small></td>'
+    '<td class="num">${low} - ${high}</td>'
+    '<td class="num">{volume:,}</td></tr>\n'
+)
+
+_STYLE_BLOCK = """<style>
+                body { font-family: Arial, sans-serif; margin: 0; padding: 20px; background-color: #f5f5f5; }
+                .container { max-width: 800px; margin: 0 auto; background-color: white; border-radius: 8px; padding: 20px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
+                h2 { color: #333; margin-top: 0; }
+                table { width: 100%; border-collapse: collapse; margin-top: 20px; }
+                th { background-color: #4CAF50; color: white; padding: 12px; text-align: left; }
+                td { padding: 12px; border-bottom: 1px solid #ddd; }
+                .num { text-align: right; }
+                td.up { color: green; }
+                td.down { color: red; }
+                small.name { color: #666; }
+                .footer { margin-top: 20px; padding-top: 20px; border-top: 1px solid #ddd; color: #666; font-size: 12px; }
+            </style>"""
+
+# Constant page shell; a report is _HEADER + timestamp + _MID + rows + _FOOTER
+_HEADER = """
+        <html>
+        <head>
+            """ + _STYLE_BLOCK + """
+        </head>
+        <body>
+            <div class="container">
+                <h2>📊 Stock Monitor Report</h2>
+                <p><strong>Report Time:</strong> """
+
+_MID = """</p>
+                
+                <table>
+                    <thead>
+                        <tr>
+                            <th>Stock</th>
+                            <th class="num">Price</th>
+                            <th class="num">Change</th>
+                            <th class="num">Day Range</th>
+                            <th class="num">Volume</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+                        """
+
+_FOOTER = """
+                    </tbody>
+                </table>
+                
+                <div class="footer">
+                    <p>This is an automated report from your Stock Monitor Agent.</p>
+                </div>
+            </div>
+        </body>
+        </html>
+        """
+
 
 class EmailReporter:
     """Handles sending stock reports via email"""
     
     def __init__(self, smtp_server: str, smtp_port: int, 
-                 sender_email: str, sender_password: str):
+                 sender_email: str, sender_password: str,
+                 idle_timeout: float = 60.0, always_send_every: int = 6,
+                 smtp_timeout: float = 30.0):
         """
         Args:
             smtp_server: SMTP server address (e.g., 'smtp.gmail.com')
             smtp_port: SMTP port (e.g., 587 for TLS)
             sender_email: Your email address
             sender_password: Your email password or app password
+            idle_timeout: Seconds a pooled connection may sit idle before it
+                is checked with NOOP on next use (default: 60)
+            always_send_every: Send at least every Nth report even if the stock
+                data hasn't changed, as a heartbeat (default: 6)
+            smtp_timeout: Socket timeout in seconds for SMTP operations, so a
+                stalled server cannot hang the worker (default: 30)
         """
         self.smtp_server = smtp_server
         self.smtp_port = smtp_port
         self.sender_email = sender_email
         self.sender_password = sender_password
+        self.idle_timeout = idle_timeout
+        self.always_send_every = always_send_every
+        self.smtp_timeout = smtp_timeout
+        
+        # Persistent SMTP connection, reused across reports
+        self._conn = None
+        self._conn_lock = threading.Lock()
+        self._last_used = 0.0
+        
+        # Reports are sent from a background worker so callers never block on SMTP
+        self._queue = queue.Queue(maxsize=64)
+        self._worker_lock = threading.Lock()
+        self._worker_thread: Optional[threading.Thread] = None
+        self._ensure_worker()
+        
+        # Fingerprint of the last sent report, used to skip unchanged ones
+        self._last_hash: Optional[int] = None
+        self._skipped = 0
     
     def send_report(self, stock_data: Dict, recipient_email: str):
         """
-        Send formatted stock report via email
+        Queue a formatted stock report to be sent via email
+        
+        Returns immediately; the email is sent from the background worker.
+        If the queue is full the report is dropped. Reports identical to the
+        last one sent are skipped, except every always_send_every-th.
+        
+        Args:
+            stock_data: Dictionary containing stock information
+            recipient_email: Email address to send report to
+        """
+        self._enqueue(stock_data, recipient_email, None)
+    
+    def send_report_prebuilt(self, stock_data: Dict, html_body: str, recipient_email: str):
+        """
+        Queue a report whose HTML body was already built by format_and_summarize
         
         Args:
             stock_data: Dictionary containing stock information
+            html_body: HTML returned by format_and_summarize for stock_data
             recipient_email: Email address to send report to
         """
+        self._enqueue(stock_data, recipient_email, html_body)
+    
+    def _enqueue(self, stock_data: Dict, recipient_email: str, html_body: Optional[str]):
+        h = self._report_hash(stock_data, recipient_email)
+        if not self._should_send(h):
+            logger.info("No stock changes since last report to %s, skipping email", recipient_email)
+            return
+        # The worker is stopped by close(); start a new one if reporting resumes afterwards
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait((stock_data, recipient_email, html_body, h))
+        except queue.Full:
+            logger.warning("Email queue full, dropping report for %s", recipient_email)
+    
+    @staticmethod
+    def _report_hash(stock_data: Dict, recipient_email: str) -> int:
+        """Fingerprint of a report's recipient and stock figures"""
+        return hash((recipient_email,
+                     tuple((s['symbol'], s['price'], s['change']) for s in stock_data.get('stocks', []))))
+    
+    def _should_send(self, h: int) -> bool:
+        """Whether this report differs from the last one sent or is due as a heartbeat"""
+        if h == self._last_hash and self._skipped + 1 < self.always_send_every:
+            self._skipped += 1
+            return False
+        return True
+    
+    def flush(self):
+        """Block until every queued report has been sent"""
+        self._queue.join()
+    
+    def _ensure_worker(self):
+        """Start the background worker unless one is already running"""
+        with self._worker_lock:
+            if self._worker_thread is None or not self._worker_thread.is_alive():
+                self._worker_thread = threading.Thread(target=self._worker, daemon=True)
+                self._worker_thread.start()
+    
+    def _worker(self):
+        """Background thread that sends queued reports one at a time"""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._send_report_sync(*item)
+            finally:
+                self._queue.task_done()
+    
+    def _send_report_sync(self, stock_data: Dict, recipient_email: str,
+                          html_body: Optional[str] = None, report_hash: Optional[int] = None):
+        """Build and send one report on the calling thread"""
         try:
             # Create email content
             subject = f"Stock Monitor Report - {stock_data['timestamp']}"
-            html_body = self._format_html_report(stock_data)
+            if html_body is None:
+                html_body = self._format_html_report(stock_data)
             
-            # Create message
-            message = MIMEMultipart('alternative')
+            # Create message (HTML only, so no multipart wrapper is needed)
+            message = EmailMessage()
             message['Subject'] = subject
             message['From'] = self.sender_email
             message['To'] = recipient_email
+            message.set_content(html_body, subtype='html')
             
-            html_part = MIMEText(html_body, 'html')
-            message.attach(html_part)
+            # Send email over the pooled connection, reconnecting once if it went stale
+            with self._conn_lock:
+                try:
+                    self._get_conn().send_message(message)
+                except (smtplib.SMTPException, OSError):
+                    self._discard_conn()
+                    self._get_conn().send_message(message)
+                self._last_used = time.monotonic()
             
-            # Send email
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.sender_email, self.sender_password)
-                server.send_message(message)
+            # Only a report that actually went out counts as the last one sent
+            if report_hash is not None:
+                self._last_hash = report_hash
+                self._skipped = 0
             
             print(f"✓ Email report sent to {recipient_email}")
             
         except Exception as e:
-            print(f"Failed to send email: {e}")
+            logger.warning("Failed to send email: %s", e)
     
-    def _format_html_report(self, stock_data: Dict) -> str:
-        """Format stock data as HTML email"""
-        stocks = stock_data.get('stocks', [])
-        timestamp = stock_data.get('timestamp', 'N/A')
+    def close(self, timeout: float = 60.0):
+        """
+        Send any queued reports, stop the worker and close the SMTP connection
         
-        # Build stock rows
-        stock_rows = ""
-        for stock in stocks:
-            change_color = 'green' if stock['change'] >= 0 else 'red'
-            arrow = '▲' if stock['change'] >= 0 else '▼'
-            
-            stock_rows += f"""
-            <tr>
-                <td style="padding: 12px; border-bottom: 1px solid #ddd;">
-                    <strong>{stock['symbol']}</strong><br>
-                    <small style="color: #666;">{stock['name']}</small>
-                </td>
-                <td style="padding: 12px; border-bottom: 1px solid #ddd; text-align: right;">
-                    <strong>${stock['price']}</strong>
-                </td>
-                <td style="padding: 12px; border-bottom: 1px solid #ddd; text-align: right; color: {change_color};">
-                    {arrow} ${abs(stock['change'])}<br>
-                    <small>({stock['change_percent']:+.2f}%)</small>
-                </td>
-                <td style="padding: 12px; border-bottom: 1px solid #ddd; text-align: right;">
-                    ${stock['low']} - ${stock['high']}
-                </td>
-                <td style="padding: 12px; border-bottom: 1px solid #ddd; text-align: right;">
-                    {stock['volume']:,}
-                </td>
-            </tr>
-            """
+        Reporting can resume afterwards; the next report starts a new worker.
         
-        html = f"""
-        <html>
-        <head>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 0; padding: 20px; background-color: #f5f5f5; }}
-                .container {{ max-width: 800px; margin: 0 auto; background-color: white; border-radius: 8px; padding: 20px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
-                h2 {{ color: #333; margin-top: 0; }}
-                table {{ width: 100%; border-collapse: collapse; margin-top: 20px; }}
-                th {{ background-color: #4CAF50; color: white; padding: 12px; text-align: left; }}
-                .footer {{ margin-top: 20px; padding-top: 20px; border-top: 1px solid #ddd; color: #666; font-size: 12px; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h2>📊 Stock Monitor Report</h2>
-                <p><strong>Report Time:</strong> {timestamp}</p>
-                
-                <table>
-                    <thead>
-                        <tr>
-                            <th>Stock</th>
-                            <th style="text-align: right;">Price</th>
-                            <th style="text-align: right;">Change</th>
-                            <th style="text-align: right;">Day Range</th>
-                            <th style="text-align: right;">Volume</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                        {stock_rows}
-                    </tbody>
-                </table>
-                
-                <div class="footer">
-                    <p>This is an automated report from your Stock Monitor Agent.</p>
-                </div>
-            </div>
-        </body>
-        </html>
+        Args:
+            timeout: Seconds to wait for the worker to drain the queue (default: 60)
+        """
+        with self._worker_lock:
+            worker = self._worker_thread
+            if worker is not None and worker.is_alive():
+                self._queue.put(None)
+                worker.join(timeout)
+                if worker.is_alive():
+                    logger.warning("Email worker still busy after %.0fs; leaving it to finish in the background", timeout)
+        
+        with self._conn_lock:
+            if self._conn is not None:
+                try:
+                    self._conn.quit()
+                except (smtplib.SMTPException, OSError):
+                    pass
+                self._conn = None
+    
+    def _get_conn(self) -> smtplib.SMTP:
+        """Return a live, logged-in SMTP connection. Caller must hold _conn_lock."""
+        if self._conn is not None and time.monotonic() - self._last_used > self.idle_timeout:
+            # Idle long enough that the server may have dropped us
+            try:
+                if self._conn.noop()[0] != 250:
+                    self._discard_conn()
+            except (smtplib.SMTPException, OSError):
+                self._discard_conn()
+        
+        if self._conn is None:
+            conn = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=self.smtp_timeout)
+            conn.ehlo()
+            conn.starttls()
+            conn.ehlo()
+            conn.login(self.sender_email, self.sender_password)
+            self._conn = conn
+            self._last_used = time.monotonic()
+        return self._conn
+    
+    def _discard_conn(self):
+        """Drop the pooled connection without waiting on the server. Caller must hold _conn_lock."""
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except OSError:
+                pass
+            self._conn = None
+    
+    def format_and_summarize(self, stock_data: Dict) -> Tuple[str, List[str]]:
         """
+        Build the HTML report and the console summary in a single pass over the stocks
         
-        return html
+        Returns:
+            (html_body, console_lines) where console_lines has one line per stock
+        """
+        stocks = stock_data.get('stocks', [])
+        timestamp = stock_data.get('timestamp', 'N/A')
+        
+        rows, lines = _build_rows(stocks)
+        return _HEADER + str(timestamp) + _MID + rows + _FOOTER, lines
+    
+    def _format_html_report(self, stock_data: Dict) -> str:
+        """Format stock data as HTML email"""
+        return self.format_and_summarize(stock_data)[0]
+
+
+def _build_rows(stocks: List[Dict]) -> Tuple[str, List[str]]:
+    """
+    Render the table rows and console lines for a list of stocks
+    
+    This is the only per-stock loop in the report path; it touches no
+    reporter state so it can be swapped for a compiled version if needed.
+    """
+    rows = []
+    lines = []
+    for stock in stocks:
+        change = stock['change']
+        up = change >= 0
+        rows.append(_ROW_TMPL.format(
+            direction='up' if up else 'down',
+            arrow='▲' if up else '▼',
+            abs_change=change if up else -change,
+            **stock
+        ))
+        lines.append(f"  {stock['symbol']}: ${stock['price']} ({stock['change_percent']:+.2f}%)")
+    return "".join(rows), lines
 
 
 # Quick setup helper
@@ -3,12 +3,21 @@ Proactive Stock Monitor Tool
 Monitors stock prices at scheduled intervals and triggers callbacks
 """
 
+import functools
+import logging
+import os
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Callable, List, Dict
+from typing import Callable, List, Dict, Tuple
 import yfinance as yf
 
+logger = logging.getLogger(__name__)
+
+# Company names rarely change; refresh cached names once a day
+NAME_CACHE_TTL_SECONDS = 24 * 60 * 60
+
 
 class StockMonitor:
     """Background monitor that checks stocks at regular intervals"""
@@ -21,21 +30,45 @@ class StockMonitor:
         """
         self.callback = callback
         self.interval_seconds = interval_minutes * 60
-        self.watchlist: List[str] = []
+        # Set for O(1) membership, list to keep insertion order; both guarded by the lock
+        self._watchset: set = set()
+        self._watchlist: List[str] = []
+        self._watch_lock = threading.Lock()
         self.is_running = False
         self.monitor_thread = None
+        self._stop_event = threading.Event()
+        # Worker threads for per-symbol lookups, alive while the monitor runs
+        self._pool = None
+        # symbol -> (company name, monotonic fetch time)
+        self._name_cache: Dict[str, Tuple[str, float]] = {}
+        # symbol -> (latest quote with timestamp, monotonic fetch time)
+        self._last_snapshot: Dict[str, Tuple[Dict, float]] = {}
+    
+    @property
+    def watchlist(self) -> Tuple[str, ...]:
+        """Snapshot of the watched symbols in the order they were added"""
+        with self._watch_lock:
+            return tuple(self._watchlist)
     
     def add_stock(self, symbol: str):
         """Add a stock to the watchlist"""
-        if symbol not in self.watchlist:
-            self.watchlist.append(symbol.upper())
-            print(f"Added {symbol} to watchlist")
+        sym = symbol.upper()
+        with self._watch_lock:
+            if sym in self._watchset:
+                return
+            self._watchset.add(sym)
+            self._watchlist.append(sym)
+        print(f"Added {symbol} to watchlist")
     
     def remove_stock(self, symbol: str):
         """Remove a stock from the watchlist"""
-        if symbol.upper() in self.watchlist:
-            self.watchlist.remove(symbol.upper())
-            print(f"Removed {symbol} from watchlist")
+        sym = symbol.upper()
+        with self._watch_lock:
+            if sym not in self._watchset:
+                return
+            self._watchset.remove(sym)
+            self._watchlist.remove(sym)
+        print(f"Removed {symbol} from watchlist")
     
     def start(self):
         """Start the background monitoring"""
@@ -44,6 +77,8 @@ class StockMonitor:
             return
         
         self.is_running = True
+        self._stop_event.clear()
+        self._pool = ThreadPoolExecutor(max_workers=min(16, (os.cpu_count() or 2) * 4))
         self.monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
         self.monitor_thread.start()
         print(f"✓ Monitor started - checking every {self.interval_seconds // 60} minutes")
@@ -51,58 +86,152 @@ class StockMonitor:
     def stop(self):
         """Stop the background monitoring"""
         self.is_running = False
+        self._stop_event.set()
         if self.monitor_thread:
             self.monitor_thread.join(timeout=5)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
         print("Monitor stopped")
     
     def _monitor_loop(self):
         """Main monitoring loop running in background thread"""
+        # Ticks are anchored to a monotonic deadline so fetch time doesn't add drift
+        next_tick = time.monotonic()
         while self.is_running:
             try:
-                if self.watchlist:
+                if self._watchset:
                     stock_data = self._fetch_stock_data()
                     self.callback(stock_data)
             except Exception as e:
-                print(f"Monitor error: {e}")
+                logger.warning("Monitor error: %s", e)
             
-            # Wait for next interval
-            time.sleep(self.interval_seconds)
+            # Wait for next interval, waking immediately if stop() is called
+            next_tick += self.interval_seconds
+            delay = max(0, next_tick - time.monotonic())
+            if self._stop_event.wait(delay):
+                return
     
     def _fetch_stock_data(self) -> Dict:
         """Fetch current data for all stocks in watchlist"""
         results = {
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'timestamp': datetime.now().isoformat(sep=' ', timespec='seconds'),
             'stocks': []
         }
         
-        for symbol in self.watchlist:
+        symbols = list(self.watchlist)
+        if not symbols:
+            return results
+        
+        # One batched request for every symbol instead of one per ticker
+        try:
+            data = yf.download(tickers=" ".join(symbols), period='1d', group_by='ticker',
+                               threads=True, progress=False)
+        except Exception as e:
+            logger.warning("Error fetching %s: %s", ", ".join(symbols), e)
+            return results
+        
+        # Look up names for newly added symbols concurrently rather than one by one
+        missing = [symbol for symbol in symbols if not self._has_fresh_name(symbol)]
+        pool = self._pool
+        if len(missing) > 1 and pool is not None:
+            list(pool.map(self._get_name, missing))
+        
+        fetched_at = time.monotonic()
+        for symbol in symbols:
             try:
-                stock = yf.Ticker(symbol)
-                info = stock.info
-                hist = stock.history(period='1d')
-                
-                if not hist.empty:
-                    current_price = hist['Close'].iloc[-1]
-                    open_price = hist['Open'].iloc[0]
-                    change = current_price - open_price
-                    change_percent = (change / open_price) * 100
-                    
-                    stock_info = {
-                        'symbol': symbol,
-                        'name': info.get('longName', symbol),
-                        'price': round(current_price, 2),
-                        'change': round(change, 2),
-                        'change_percent': round(change_percent, 2),
-                        'volume': hist['Volume'].iloc[-1],
-                        'high': round(hist['High'].max(), 2),
-                        'low': round(hist['Low'].min(), 2)
-                    }
+                hist = _history_for(data, symbol)
+                if hist is not None and not hist.empty:
+                    stock_info = _build_quote(symbol, self._get_name(symbol), hist)
                     results['stocks'].append(stock_info)
+                    self._last_snapshot[symbol] = (
+                        dict(stock_info, timestamp=results['timestamp']), fetched_at)
                     
             except Exception as e:
-                print(f"Error fetching {symbol}: {e}")
+                logger.warning("Error fetching %s: %s", symbol, e)
         
         return results
+    
+    def snapshot(self, symbol: str, max_age_s: float = 60) -> Dict:
+        """
+        Get a snapshot of a single stock, reusing the monitor's latest data when fresh
+        
+        Args:
+            symbol: Stock symbol to look up
+            max_age_s: Oldest cached quote (in seconds) that may be returned
+        """
+        sym = symbol.upper()
+        cached = self._last_snapshot.get(sym)
+        if cached is not None and time.monotonic() - cached[1] < max_age_s:
+            return dict(cached[0])
+        
+        quote = _fetch_snapshot(sym, self._get_name)
+        if 'error' not in quote:
+            self._last_snapshot[sym] = (dict(quote), time.monotonic())
+        return quote
+    
+    def _has_fresh_name(self, symbol: str) -> bool:
+        """Whether symbol has a cached name younger than NAME_CACHE_TTL_SECONDS"""
+        cached = self._name_cache.get(symbol)
+        return cached is not None and time.monotonic() - cached[1] < NAME_CACHE_TTL_SECONDS
+    
+    def _get_name(self, symbol: str) -> str:
+        """Return the company name for symbol, looking it up when missing or stale"""
+        if self._has_fresh_name(symbol):
+            return self._name_cache[symbol][0]
+        try:
+            name = yf.Ticker(symbol).info.get('longName', symbol)
+        except Exception:
+            # Don't cache the fallback so the lookup is retried next interval;
+            # a stale name is still better than the bare symbol
+            cached = self._name_cache.get(symbol)
+            return cached[0] if cached else symbol
+        self._name_cache[symbol] = (name, time.monotonic())
+        return name
+
+
+@functools.lru_cache(maxsize=512)
+def _name_for(symbol: str) -> str:
+    """Company name for symbol, memoized for on-demand snapshots"""
+    return yf.Ticker(symbol).info.get('longName', symbol)
+
+
+def _history_for(data, symbol: str):
+    """Pull one symbol's rows out of a yf.download(group_by='ticker') frame"""
+    if hasattr(data.columns, 'levels'):
+        if symbol not in data.columns.get_level_values(0):
+            return None
+        hist = data[symbol]
+    else:
+        # Older yfinance returns flat columns for a single ticker
+        hist = data
+    return hist.dropna(how='all')
+
+
+def _build_quote(symbol: str, name: str, hist) -> Dict:
+    """Summarize a day of price history into the quote dict used by reports"""
+    # One conversion to a plain array instead of a pandas lookup per field
+    arr = hist[['Open', 'Close', 'High', 'Low', 'Volume']].to_numpy()
+    open_price = arr[0, 0]
+    current_price = arr[-1, 1]
+    if len(arr) == 1:
+        # period='1d' gives a single daily bar, so there is nothing to reduce
+        high, low = arr[0, 2], arr[0, 3]
+    else:
+        high, low = arr[:, 2].max(), arr[:, 3].min()
+    change = current_price - open_price
+    change_percent = (change / open_price) * 100
+    
+    return {
+        'symbol': symbol,
+        'name': name,
+        'price': round(current_price, 2),
+        'change': round(change, 2),
+        'change_percent': round(change_percent, 2),
+        'volume': int(arr[-1, 4]),
+        'high': round(high, 2),
+        'low': round(low, 2)
+    }
 
 
 def get_stock_snapshot(symbol: str) -> Dict:
@@ -110,29 +239,24 @@ def get_stock_snapshot(symbol: str) -> Dict:
     Get immediate snapshot of a single stock
     Useful for on-demand queries
     """
+    return _fetch_snapshot(symbol.upper(), _name_for)
+
+
+def _fetch_snapshot(symbol: str, get_name: Callable[[str], str]) -> Dict:
+    """Fetch one symbol's latest quote, resolving its name with get_name"""
     try:
-        stock = yf.Ticker(symbol.upper())
-        info = stock.info
+        stock = yf.Ticker(symbol)
         hist = stock.history(period='1d')
         
         if hist.empty:
             return {'error': f'No data available for {symbol}'}
         
-        current_price = hist['Close'].iloc[-1]
-        open_price = hist['Open'].iloc[0]
-        change = current_price - open_price
-        change_percent = (change / open_price) * 100
-        
-        return {
-            'symbol': symbol.upper(),
-            'name': info.get('longName', symbol),
-            'price': round(current_price, 2),
-            'change': round(change, 2),
-            'change_percent': round(change_percent, 2),
-            'volume': hist['Volume'].iloc[-1],
-            'high': round(hist['High'].max(), 2),
-            'low': round(hist['Low'].min(), 2),
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        }
+        try:
+            name = get_name(symbol)
+        except Exception:
+            name = symbol
+        quote = _build_quote(symbol, name, hist)
+        quote['timestamp'] = datetime.now().isoformat(sep=' ', timespec='seconds')
+        return quote
     except Exception as e:
         return {'error': str(e)}
\ No newline at end of file
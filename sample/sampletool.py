@@ -1,6 +1,11 @@
 from langchain_core.tools import tool
 from typing import Optional, List
 import json
+try:
+    import orjson
+except ImportError:
+    # orjson is optional; fall back to the standard library
+    orjson = None
 
 # ==========================================
 # Core principle (Note for developer):
@@ -9,6 +14,12 @@ import json
 # 3. Never just raise exception or crashes, but return a string that contains the error information.
 # ==========================================
 
+def _dumps(obj) -> str:
+    # orjson output is always UTF-8, so it matches json.dumps(..., ensure_ascii=False)
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False)
+
 @tool
 def sampleTool(query: str, limit: int = 5) -> str: # 这个工具的名称是 sampleTool
     """
@@ -37,7 +48,7 @@ def sampleTool(query: str, limit: int = 5) -> str: # 这个工具的名称是 sa
 
         # --- 3. format output(optional) ---
         # It is the best to let agent to read json
-        return json.dumps(result, ensure_ascii=False)
+        return _dumps(result)
 
     except Exception as e:
         # --- 4. Error handler ---
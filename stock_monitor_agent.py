@@ -3,7 +3,7 @@ Stock Monitor Agent Integration
 Combines proactive monitoring with email reporting
 """
 
-from proactive_monitor import StockMonitor, get_stock_snapshot
+from proactive_monitor import StockMonitor
 from email_reporter import EmailReporter, create_gmail_reporter
 
 
@@ -33,15 +33,15 @@ class StockMonitorAgent:
         """Called automatically when monitor collects data"""
         print(f"\n📊 Proactive update at {stock_data['timestamp']}")
         
+        # Build console summary and email body in one pass
+        html_body, console_lines = self.reporter.format_and_summarize(stock_data)
+        
         # Print to console
-        for stock in stock_data['stocks']:
-            symbol = stock['symbol']
-            price = stock['price']
-            change = stock['change_percent']
-            print(f"  {symbol}: ${price} ({change:+.2f}%)")
+        if console_lines:
+            print("\n".join(console_lines))
         
         # Send email report
-        self.reporter.send_report(stock_data, self.recipient_email)
+        self.reporter.send_report_prebuilt(stock_data, html_body, self.recipient_email)
     
     def add_stock(self, symbol: str):
         """Add stock to watchlist"""
@@ -58,7 +58,9 @@ class StockMonitorAgent:
     def stop(self):
         """Stop proactive monitoring"""
         self.monitor.stop()
+        self.reporter.close()
     
     def get_immediate_report(self, symbol: str) -> dict:
         """Get immediate snapshot of a stock (on-demand)"""
-        return get_stock_snapshot(symbol)
\ No newline at end of file
+        # Served from the monitor's latest fetch when it is recent enough
+        return self.monitor.snapshot(symbol)
\ No newline at end of file
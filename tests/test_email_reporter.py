@@ -0,0 +1,89 @@
+import smtplib
+import time
+
+import email_reporter
+from email_reporter import EmailReporter
+
+
+class FakeSMTP:
+    """Stands in for smtplib.SMTP and records every message sent"""
+
+    sent = []
+    timeouts = []
+
+    def __init__(self, host, port, timeout=None):
+        FakeSMTP.timeouts.append(timeout)
+
+    def ehlo(self):
+        pass
+
+    def starttls(self):
+        pass
+
+    def login(self, user, password):
+        pass
+
+    def noop(self):
+        return (250, b"OK")
+
+    def send_message(self, message):
+        FakeSMTP.sent.append(message['To'])
+
+    def quit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _wait_until_sent(count, timeout=5.0):
+    # Polls instead of flush() so a missing worker fails the test rather than hanging it
+    deadline = time.monotonic() + timeout
+    while len(FakeSMTP.sent) < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def _stock_data(price):
+    stock = {'symbol': 'AAPL', 'name': 'Apple Inc.', 'price': price, 'change': 0.0,
+             'change_percent': 0.0, 'low': price, 'high': price, 'volume': 1000}
+    return {'timestamp': 't', 'stocks': [stock]}
+
+
+def test_report_sent_after_close(monkeypatch):
+    FakeSMTP.sent = []
+    FakeSMTP.timeouts = []
+    monkeypatch.setattr(email_reporter.smtplib, 'SMTP', FakeSMTP)
+    reporter = EmailReporter('smtp.example.com', 587, 'me@example.com', 'pw', smtp_timeout=5)
+
+    reporter.send_report(_stock_data(1.0), 'a@example.com')
+    reporter.flush()
+    # What StockMonitorAgent.stop() does; start() then resumes reporting on the same reporter
+    reporter.close()
+    reporter.send_report(_stock_data(2.0), 'a@example.com')
+    _wait_until_sent(2)
+    reporter.close()
+
+    assert FakeSMTP.sent == ['a@example.com', 'a@example.com']
+    assert FakeSMTP.timeouts and all(t == 5 for t in FakeSMTP.timeouts)
+
+
+def test_failed_send_is_not_recorded_as_sent(monkeypatch):
+    FakeSMTP.sent = []
+    attempts = []
+
+    class FailingSMTP(FakeSMTP):
+        def send_message(self, message):
+            attempts.append(message['To'])
+            raise smtplib.SMTPServerDisconnected('down')
+
+    monkeypatch.setattr(email_reporter.smtplib, 'SMTP', FailingSMTP)
+    reporter = EmailReporter('smtp.example.com', 587, 'me@example.com', 'pw')
+    reporter.send_report(_stock_data(1.0), 'a@example.com')
+    reporter.flush()
+
+    monkeypatch.setattr(email_reporter.smtplib, 'SMTP', FakeSMTP)
+    reporter.send_report(_stock_data(1.0), 'a@example.com')
+    reporter.flush()
+    reporter.close()
+
+    assert attempts and FakeSMTP.sent == ['a@example.com']
@@ -1,8 +1,12 @@
 from langchain_ollama import ChatOllama
+import hashlib
 import os
 import re
 import subprocess
-import tempfile
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Tuple, Optional
 from config.settings import settings
 from langchain_core.tools import tool
@@ -70,6 +74,80 @@ Translate the user's input into code of the format defined above. Ensure the cod
 4.  Final Review -> Ensure no missing imports or syntax errors.
 """
 
+# Validated generations keyed by (model, system prompt, normalized request), most recent last
+_GENERATION_CACHE: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+_GENERATION_CACHE_MAX = 128
+_GENERATION_CACHE_LOCK = threading.Lock()
+
+# Digests of (filename, content) pairs Ruff already passed, so unchanged files are not re-linted on retry
+_RUFF_CLEAN_CACHE: "OrderedDict[str, None]" = OrderedDict()
+_RUFF_CLEAN_CACHE_MAX = 1024
+_RUFF_CLEAN_CACHE_LOCK = threading.Lock()
+
+# Read-only module constants: built once at import and safe to share across threads
+LANGUAGE_RUNNERS = MappingProxyType({
+    ".py":  (sys.executable,),           # Python: 使用当前环境
+    ".js":  ("node",),                   # JavaScript: 需要安装 Node.js
+    ".ts":  ("ts-node",),                # TypeScript: 需要安装 ts-node
+    ".sh":  ("bash",),                   # Shell: 使用 bash
+    ".go":  ("go", "run"),               # Go: 使用 go run 直接运行
+    ".rb":  ("ruby",),                   # Ruby
+    ".php": ("php",),                    # PHP
+})
+
+# Resolved once at import: the set of runners is fixed, so there is no need to walk PATH per call.
+# None means the runtime is not installed.
+_RUNNER_PATHS = MappingProxyType({
+    ext: sys.executable if cmd[0] == sys.executable else shutil.which(cmd[0])
+    for ext, cmd in LANGUAGE_RUNNERS.items()
+})
+
+# Patterns used by the response parser, compiled once at import
+# ^\s*###\s+       -> 行首(允许空格) + ### + 至少一个空格
+# ([\w\-\./]+)     -> 捕获文件名 (字母, 数字, -, ., /)
+_FILE_HEADER_RE = re.compile(r"^\s*###\s+([\w\-\./]+)", re.MULTILINE)
+_FENCE_LINE_RE = re.compile(r"^\s*```[\w+-]*\s*$", re.MULTILINE)
+_TRAILING_FENCE_RE = re.compile(r"\s*```\s*$")
+_FINAL_FENCE_LINE_RE = re.compile(r"(?:\A|\n)[ \t]*```[\w+-]*\s*\Z")
+_LANG_TAG_RE = re.compile(r"```([\w+-]+)")
+_REQUESTED_FILENAME_RE = re.compile(
+    r"\b[\w\-/]+\.(?:py|js|ts|tsx|jsx|html|css|go|java|json|yaml|yml|md)\b",
+    re.IGNORECASE,
+)
+
+# Characters of stdout/stderr kept from a runCode execution
+_OUTPUT_LIMIT = 2000
+
+_EXTENSION_MAP = MappingProxyType({
+    "python": "py",
+    "py": "py",
+    "typescript": "ts",
+    "ts": "ts",
+    "tsx": "tsx",
+    "javascript": "js",
+    "js": "js",
+    "jsx": "jsx",
+    "go": "go",
+    "golang": "go",
+    "java": "java",
+    "c": "c",
+    "cpp": "cpp",
+    "cxx": "cpp",
+    "cs": "cs",
+    "csharp": "cs",
+    "html": "html",
+    "css": "css",
+    "sql": "sql",
+    "bash": "sh",
+    "shell": "sh",
+    "sh": "sh",
+    "json": "json",
+    "yaml": "yaml",
+    "yml": "yml",
+    "markdown": "md",
+    "md": "md",
+})
+
 @tool
 def runCode(code_path: str,script_args: Optional[List[str]] = None) -> str:
     """
@@ -80,37 +158,30 @@ def runCode(code_path: str,script_args: Optional[List[str]] = None) -> str:
     Returns:
         str: STDOUT and STDERR execution results.
     """
-    LANGUAGE_RUNNERS = {
-    ".py":  [sys.executable],           # Python: 使用当前环境
-    ".js":  ["node"],                   # JavaScript: 需要安装 Node.js
-    ".ts":  ["ts-node"],                # TypeScript: 需要安装 ts-node
-    ".sh":  ["bash"],                   # Shell: 使用 bash
-    ".go":  ["go", "run"],              # Go: 使用 go run 直接运行
-    ".rb":  ["ruby"],                   # Ruby
-    ".php": ["php"],                    # PHP
-}
     if ".." in code_path or not code_path.startswith("workspace/"):
          return "Error: Security Violation. Can only run scripts in 'workspace/' directory."
-    runner = LANGUAGE_RUNNERS.get(code_path.split(".")[-1])
+    ext = os.path.splitext(code_path)[1].lower()
+    runner = LANGUAGE_RUNNERS.get(ext)
     if not runner:
         return f"Error: No runner found for {code_path}, supported are: {', '.join(LANGUAGE_RUNNERS.keys())}"
     executable = runner[0]
-    if executable != sys.executable and not shutil.which(executable):
+    resolved = _RUNNER_PATHS[ext]
+    if resolved is None:
         return f"Error: The runtime '{executable}' is not installed or not in PATH."
     safe_args = script_args if script_args else []
-    cmd = runner + safe_args + [code_path]
+    cmd = [resolved, *runner[1:], *safe_args, code_path]
     try:
         print(f"Running code: {cmd}")
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=20)
+        returncode, stdout, stderr = _run_bounded(cmd, timeout=20, limit=_OUTPUT_LIMIT)
         output = f"--- Execution Result ({executable}) ---\n"
-        if result.returncode == 0:
-            output += f"Success!\nSTDOUT:\n{result.stdout[:2000]}"
+        if returncode == 0:
+            output += f"Success!\nSTDOUT:\n{stdout}"
         else:
-            output += f"Failed (Exit Code {result.returncode})\n"
-            output += f"STDERR:\n{result.stderr[:2000]}\n"
+            output += f"Failed (Exit Code {returncode})\n"
+            output += f"STDERR:\n{stderr}\n"
             # 有些程序报错也会打在 stdout 里
-            if result.stdout:
-                output += f"STDOUT:\n{result.stdout[:2000]}"
+            if stdout:
+                output += f"STDOUT:\n{stdout}"
                 
         return output
     except subprocess.TimeoutExpired:
@@ -118,6 +189,46 @@ def runCode(code_path: str,script_args: Optional[List[str]] = None) -> str:
     except Exception as e:
         return f"Error: {e}"
 
+def _run_bounded(cmd: List[str], timeout: float, limit: int) -> Tuple[int, str, str]:
+    """
+    Run cmd and return (returncode, stdout, stderr), keeping only the first `limit`
+    characters of each stream. The rest is read and discarded so memory stays bounded
+    no matter how much the child prints. Raises subprocess.TimeoutExpired after killing it.
+    """
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors="replace",
+    )
+    captured = {"stdout": [], "stderr": []}
+
+    def drain(stream, chunks):
+        kept = 0
+        for chunk in iter(lambda: stream.read(4096), ""):
+            if kept < limit:
+                chunks.append(chunk[: limit - kept])
+                kept += len(chunks[-1])
+        stream.close()
+
+    readers = [
+        threading.Thread(target=drain, args=(proc.stdout, captured["stdout"]), daemon=True),
+        threading.Thread(target=drain, args=(proc.stderr, captured["stderr"]), daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+    try:
+        returncode = proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+        raise
+    finally:
+        for reader in readers:
+            reader.join(timeout=1)
+    return returncode, "".join(captured["stdout"]), "".join(captured["stderr"])
+
 @tool
 def generateCode(code_request: str, max_attempts: int = 5) -> Dict[str, str]:
     """
@@ -141,15 +252,27 @@ def generateCode(code_request: str, max_attempts: int = 5) -> Dict[str, str]:
     if max_attempts < 1:
         raise ValueError("max_attempts must be at least 1.")
 
+    cache_key = _generation_cache_key(code_request)
+    cached = _get_cached_generation(cache_key)
+    if cached is not None:
+        print("[Coding Model] Reusing code generated for an identical request.")
+        _save_files(cached)
+        return f"Successfully generated code and saved to workspace directory. {_describe_saved_files(cached)}"
+
     model = ChatOllama(model=settings.codingModelName, temperature=0.1, keep_alive="5m")
-    messages = [{"role": "system", "content": coding_prompt}, {"role": "user", "content": code_request}]
+    # The system prompt and request form a fixed prefix that is resent byte-for-byte on
+    # every attempt so Ollama can reuse its KV cache; only the retry tail changes.
+    base_messages = [{"role": "system", "content": coding_prompt}, {"role": "user", "content": code_request}]
+    retry_tail = []
+    # Feedback from every failed attempt, so a fix for an earlier error is not undone by a later retry
+    feedback_log: List[str] = []
 
     expected_files = _extract_requested_filenames(code_request)
     expected_min_files = max(1, len(expected_files))
 
     for attempt in range(1, max_attempts + 1):
         print(f"[Coding Model] Generating code (Attempt {attempt}/{max_attempts})...") 
-        response = model.invoke(messages)
+        response = model.invoke(base_messages + retry_tail)
         ai_code = response.content or ""
         extracted = parse_code_response(ai_code)
         if not extracted:
@@ -161,6 +284,13 @@ def generateCode(code_request: str, max_attempts: int = 5) -> Dict[str, str]:
             expected_files,
             expected_min_files,
         )
+        if not validation_ok and _repair_dangling_fences(extracted):
+            # Leftover fences are a formatting slip we can fix here instead of spending an LLM call
+            validation_ok, validation_errors = _validate_generated_files(
+                extracted,
+                expected_files,
+                expected_min_files,
+            )
         if not validation_ok:
             if attempt < max_attempts:
                 feedback = (
@@ -169,15 +299,15 @@ def generateCode(code_request: str, max_attempts: int = 5) -> Dict[str, str]:
                     "format (### filename + fenced code blocks).\n\n"
                     f"{validation_errors}"
                 )
-                messages.append({"role": "assistant", "content": ai_code})
-                messages.append({"role": "user", "content": feedback})
+                feedback_log.append(f"Attempt {attempt}: {feedback}")
+                retry_tail = _retry_messages(ai_code, feedback_log)
                 continue
 
         ruff_ok, ruff_errors = _run_ruff_check(extracted)
         if ruff_ok and validation_ok:
-            for filename,code in extracted.items():
-                saveCode(filename,code)
-            return f"Successfully generated code and saved to workspace directory. The code is: {'\n'.join([f'{filename}: {code}' for filename, code in extracted.items()])}. The path of the saved code is: {'\n'.join([f'{filename}: {os.path.join(settings.workspaceDir, filename)}' for filename in extracted.keys()])}. You can now run the code using the runCode tool."
+            _store_cached_generation(cache_key, extracted)
+            _save_files(extracted)
+            return f"Successfully generated code and saved to workspace directory. {_describe_saved_files(extracted)}"
 
         if attempt < max_attempts:
             feedback = (
@@ -186,16 +316,62 @@ def generateCode(code_request: str, max_attempts: int = 5) -> Dict[str, str]:
                 "in the exact same format (### filename + fenced code blocks).\n\n"
                 f"{ruff_errors}"
             )
-            messages.append({"role": "assistant", "content": ai_code})
-            messages.append({"role": "user", "content": feedback})
+            feedback_log.append(f"Attempt {attempt}: {feedback}")
+            retry_tail = _retry_messages(ai_code, feedback_log)
 
     # extracted["_warning"] = (
     #     "Code generation did not pass validation or Ruff checks after "
     #     f"{max_attempts} attempts. Output may contain lint errors."
     # )
-    for filename,code in extracted.items():
-        saveCode(filename,code)
-    return f"Successfully generated code and saved to workspace directory but failed to pass validation or Ruff checks. The code is: {'\n'.join([f'{filename}: {code}' for filename, code in extracted.items()])}. The path of the saved code is: {'\n'.join([f'{filename}: {os.path.join(settings.workspaceDir, filename)}' for filename in extracted.keys()])}. You can now run the code using the runCode tool."
+    _save_files(extracted)
+    return f"Successfully generated code and saved to workspace directory but failed to pass validation or Ruff checks. {_describe_saved_files(extracted)}"
+
+
+def _retry_messages(ai_code: str, feedback_log: List[str]) -> List[Dict[str, str]]:
+    """
+    Messages appended after the fixed prefix: the latest attempt, then one user message with the
+    feedback from all attempts so far (oldest first).
+    """
+    feedback = "\n\n".join(feedback_log)
+    if len(feedback_log) > 1:
+        feedback = "Earlier attempts were rejected too; make sure none of these issues come back.\n\n" + feedback
+    return [{"role": "assistant", "content": ai_code}, {"role": "user", "content": feedback}]
+
+
+def _describe_saved_files(files: Dict[str, str]) -> str:
+    """Describe saved files (contents and workspace paths) for the tool's reply."""
+    code_listing = "\n".join(f"{filename}: {code}" for filename, code in files.items())
+    path_listing = "\n".join(
+        f"{filename}: {os.path.join(settings.workspaceDir, filename)}" for filename in files
+    )
+    return (
+        f"The code is: {code_listing}. The path of the saved code is: {path_listing}. "
+        "You can now run the code using the runCode tool."
+    )
+
+
+def _generation_cache_key(code_request: str) -> str:
+    """Key a request by model and system prompt so either changing invalidates entries."""
+    normalized = " ".join(code_request.split())
+    material = "\0".join((settings.codingModelName, coding_prompt, normalized))
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _get_cached_generation(key: str) -> Optional[Dict[str, str]]:
+    with _GENERATION_CACHE_LOCK:
+        files = _GENERATION_CACHE.get(key)
+        if files is None:
+            return None
+        _GENERATION_CACHE.move_to_end(key)
+        return dict(files)
+
+
+def _store_cached_generation(key: str, files: Dict[str, str]) -> None:
+    with _GENERATION_CACHE_LOCK:
+        _GENERATION_CACHE[key] = dict(files)
+        _GENERATION_CACHE.move_to_end(key)
+        while len(_GENERATION_CACHE) > _GENERATION_CACHE_MAX:
+            _GENERATION_CACHE.popitem(last=False)
 
 def parse_code_response(raw_response: str) -> Dict[str, str]:
     """
@@ -219,22 +395,22 @@ def parse_code_response(raw_response: str) -> Dict[str, str]:
     files = {}
     
     # 1. 预处理：即使模型很乖，也要防一手它在 ### 前面加了废话
-    # 我们用正则找 ### filename，支持常见的文件扩展名
-    # Pattern 解释:
-    # ^\s*###\s+       -> 行首(允许空格) + ### + 至少一个空格
-    # ([\w\-\./]+)     -> 捕获文件名 (字母, 数字, -, ., /)
-    pattern = re.compile(r"^\s*###\s+([\w\-\./]+)", re.MULTILINE)
+    # 我们用正则找 ### filename，支持常见的文件扩展名 (见 _FILE_HEADER_RE)
     
     # 找出所有分割点
-    matches = list(pattern.finditer(raw_response))
+    matches = list(_FILE_HEADER_RE.finditer(raw_response))
     
     # Case A: 单文件 (没有 ### 分割)
     if not matches:
         # 如果没找到 ###，假设整个回复就是一个单文件代码
         # 尝试提取 markdown 块，如果没有 markdown 块，就返回原始内容
-        content = _strip_markdown(raw_response)
+        # 同一次扫描顺便拿到第一个语言标签，用来决定默认文件名
+        content, language = _strip_markdown(raw_response)
         # 默认给个名字，或者根据内容猜测
-        default_name = _detect_default_filename(raw_response)
+        if language:
+            default_name = _filename_for_language(language)
+        else:
+            default_name = _detect_default_filename(raw_response)
         return {default_name: content}
 
     # Case B: 多文件
@@ -248,67 +424,79 @@ def parse_code_response(raw_response: str) -> Dict[str, str]:
         else:
             end_pos = len(raw_response)
             
-        # 提取内容
-        code_block = raw_response[start_pos:end_pos]
-        
-        # 清理 Markdown 标记 (```python ... ```)
-        clean_code = _strip_markdown(code_block)
+        # 清理 Markdown 标记 (```python ... ```)，直接在原字符串的区间上匹配，不复制子串
+        clean_code, _ = _strip_markdown(raw_response, start_pos, end_pos)
         
         if clean_code:
             files[filename] = clean_code
 
     return files
 
-def _strip_markdown(text: str) -> str:
-    """Remove Markdown code block markers and leading/trailing whitespace."""
-    text = text.strip()
-
-    code_blocks = re.findall(r"```(?:[\w+-]+)?\s*(.*?)```", text, flags=re.DOTALL)
+def _strip_markdown(text: str, start: int = 0, end: Optional[int] = None) -> Tuple[str, Optional[str]]:
+    """
+    Remove Markdown code block markers and leading/trailing whitespace from text[start:end].
+    Fenced blocks are matched in place on the span, so no substring is built for them.
+    Returns (clean_code, language) where language is the first fence's tag, or None.
+    """
+    if end is None:
+        end = len(text)
+
+    code_blocks = []
+    language = None
+    for tag, body_start, body_end in _scan_fences(text, start, end):
+        if language is None and tag:
+            language = tag
+        block = text[body_start:body_end].strip()
+        if block:
+            code_blocks.append(block)
     if code_blocks:
-        return "\n\n".join(block.strip() for block in code_blocks if block.strip())
+        return "\n\n".join(code_blocks), language
+
+    text = _FENCE_LINE_RE.sub("", text[start:end].strip())
+    text = _TRAILING_FENCE_RE.sub("", text)
+    return text.strip(), language
 
-    text = re.sub(r"^\s*```[\w+-]*\s*$", "", text, flags=re.MULTILINE)
-    text = re.sub(r"\s*```\s*$", "", text)
-    return text.strip()
+
+def _scan_fences(text: str, start: int = 0, end: Optional[int] = None) -> List[Tuple[str, int, int]]:
+    """
+    Return (language tag, start, end) for each fenced code block body in text[start:end].
+    The tag is "" when the fence has none.
+    Same matches as re.finditer(r"```(?:[\w+-]+)?\s*(.*?)```", re.DOTALL), but str.find jumps between fences in C and
+    only the short language tag is stepped through in Python, instead of the regex engine
+    advancing the lazy body one character at a time.
+    """
+    if end is None:
+        end = len(text)
+    spans = []
+    pos = start
+    while True:
+        open_at = text.find("```", pos, end)
+        if open_at < 0:
+            return spans
+        tag_end = open_at + 3
+        while tag_end < end and (text[tag_end].isalnum() or text[tag_end] in "_+-"):
+            tag_end += 1
+        body_start = tag_end
+        while body_start < end and text[body_start].isspace():
+            body_start += 1
+        close_at = text.find("```", body_start, end)
+        if close_at < 0:
+            return spans
+        spans.append((text[open_at + 3:tag_end], body_start, close_at))
+        pos = close_at + 3
 
 
 def _detect_default_filename(raw_response: str) -> str:
     """Guess default filename based on code block language or content."""
-    language_match = re.search(r"```([\w+-]+)", raw_response or "")
+    language_match = _LANG_TAG_RE.search(raw_response or "")
     if not language_match:
         return "main.txt"
 
-    language = language_match.group(1).lower()
-    extension_map = {
-        "python": "py",
-        "py": "py",
-        "typescript": "ts",
-        "ts": "ts",
-        "tsx": "tsx",
-        "javascript": "js",
-        "js": "js",
-        "jsx": "jsx",
-        "go": "go",
-        "golang": "go",
-        "java": "java",
-        "c": "c",
-        "cpp": "cpp",
-        "cxx": "cpp",
-        "cs": "cs",
-        "csharp": "cs",
-        "html": "html",
-        "css": "css",
-        "sql": "sql",
-        "bash": "sh",
-        "shell": "sh",
-        "sh": "sh",
-        "json": "json",
-        "yaml": "yaml",
-        "yml": "yml",
-        "markdown": "md",
-        "md": "md",
-    }
-    extension = extension_map.get(language, "txt")
+    return _filename_for_language(language_match.group(1))
+
+
+def _filename_for_language(language: str) -> str:
+    extension = _EXTENSION_MAP.get(language.lower(), "txt")
     return f"main.{extension}"
 
 
@@ -316,16 +504,8 @@ def _extract_requested_filenames(code_request: str) -> List[str]:
     """Try to detect explicit filenames requested by the user."""
     if not code_request:
         return []
-    pattern = re.compile(
-        r"\b[\w\-/]+\.(py|js|ts|tsx|jsx|html|css|go|java|json|yaml|yml|md)\b",
-        re.IGNORECASE,
-    )
-    full_matches = re.findall(
-        r"\b[\w\-/]+\.(?:py|js|ts|tsx|jsx|html|css|go|java|json|yaml|yml|md)\b",
-        code_request,
-        flags=re.IGNORECASE,
-    )
-    return [match for match in full_matches]
+    # The extension group is non-capturing so findall yields whole filenames, not extensions
+    return _REQUESTED_FILENAME_RE.findall(code_request)
 
 
 def _validate_generated_files(
@@ -353,33 +533,92 @@ def _validate_generated_files(
     return (len(errors) == 0, "\n".join(errors))
 
 
+def _repair_dangling_fences(files: Dict[str, str]) -> bool:
+    """
+    Drop an unmatched fence line at the very end of an extracted file, in place. Returns True if anything
+    changed. Fences elsewhere may belong to the file (e.g. Markdown or a docstring), so they are left for
+    validation to report.
+    """
+    repaired = False
+    for name, content in files.items():
+        if len(_FENCE_LINE_RE.findall(content)) % 2 == 0:
+            continue
+        match = _FINAL_FENCE_LINE_RE.search(content)
+        if match is None:
+            continue
+        files[name] = content[:match.start()].rstrip()
+        print(f"[Coding Model] Removed a stray closing ``` at the end of {name}.")
+        repaired = True
+    return repaired
+
+
 def _run_ruff_check(files: Dict[str, str]) -> Tuple[bool, str]:
     """Run Ruff on extracted Python files. Returns (ok, errors)."""
-    python_files = {name: content for name, content in files.items() if name.endswith(".py")}
+    python_files = {
+        name: content
+        for name, content in files.items()
+        if name.endswith(".py") and not _is_known_clean(name, content)
+    }
     if not python_files:
         return True, ""
 
-    with tempfile.TemporaryDirectory() as temp_dir:
-        for filename, content in python_files.items():
-            safe_path = os.path.join(temp_dir, filename)
-            os.makedirs(os.path.dirname(safe_path), exist_ok=True)
-            with open(safe_path, "w", encoding="utf-8") as handle:
-                handle.write(content)
-
-        result = subprocess.run(
-            ["ruff", "check", temp_dir],
-            capture_output=True,
-            text=True,
-            check=False,
-        )
+    # Each check is its own ruff process, so files are linted side by side
+    with ThreadPoolExecutor(max_workers=min(len(python_files), os.cpu_count() or 1)) as pool:
+        results = list(pool.map(_ruff_check_source, python_files.keys(), python_files.values()))
+    all_errors = [errors for ok, errors in results if not ok]
+
+    if not all_errors:
+        return True, ""
+    return False, "\n".join(all_errors)
+
+
+def _ruff_digest(filename: str, content: str) -> str:
+    # The filename is part of the key: Ruff applies some rules by path (e.g. __init__.py)
+    return hashlib.blake2b(f"{filename}\0{content}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _is_known_clean(filename: str, content: str) -> bool:
+    digest = _ruff_digest(filename, content)
+    with _RUFF_CLEAN_CACHE_LOCK:
+        if digest not in _RUFF_CLEAN_CACHE:
+            return False
+        _RUFF_CLEAN_CACHE.move_to_end(digest)
+        return True
+
+
+def _ruff_check_source(filename: str, content: str) -> Tuple[bool, str]:
+    """Lint one file by piping it to Ruff on stdin (no temp files). Returns (ok, errors)."""
+    # --isolated: no config discovery, same as the old temp-dir run that had none
+    result = subprocess.run(
+        ["ruff", "check", "--isolated", "--stdin-filename", filename, "-"],
+        input=content,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
 
     if result.returncode == 0:
+        digest = _ruff_digest(filename, content)
+        with _RUFF_CLEAN_CACHE_LOCK:
+            _RUFF_CLEAN_CACHE[digest] = None
+            while len(_RUFF_CLEAN_CACHE) > _RUFF_CLEAN_CACHE_MAX:
+                _RUFF_CLEAN_CACHE.popitem(last=False)
         return True, ""
 
     errors = (result.stdout or "").strip()
     if result.stderr:
         errors = f"{errors}\n{result.stderr.strip()}".strip()
-    return False, errors or "Ruff reported issues but did not return details."
+    return False, errors or f"Ruff reported issues in {filename} but did not return details."
+
+def _save_files(files: Dict[str, str]) -> None:
+    """Write all generated files to the workspace, in parallel when there is more than one."""
+    if len(files) <= 1:
+        for filename, code in files.items():
+            saveCode(filename, code)
+        return
+    os.makedirs(settings.workspaceDir, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=min(len(files), 8)) as pool:
+        list(pool.map(saveCode, files.keys(), files.values()))
 
 def saveCode(filename: str,code: str) -> Optional[str] :
     """
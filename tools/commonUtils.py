@@ -0,0 +1,174 @@
+# Shared helpers for the HTTP-backed tool modules (response caching, request deduplication, JSON, date checks).
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import date
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    # orjson is optional; fall back to the standard library
+    orjson = None
+
+
+# Transient failures (connection errors, 429 and 5xx gateway errors) are retried up to 3 times with
+# exponential backoff (0.3 s, 0.6 s, 1.2 s) inside the adapter; once retries run out the last response is
+# returned as-is. Retry-After is ignored so a rate-limited server cannot stall a tool call for minutes.
+_RETRY = Retry(
+    total=3,
+    backoff_factor=0.3,
+    status_forcelist=(429, 502, 503, 504),
+    allowed_methods=frozenset({"GET"}),
+    respect_retry_after_header=False,
+    raise_on_status=False,
+)
+
+
+def make_session(
+    headers: Optional[Dict[str, str]] = None,
+    pool_connections: int = 10,
+    pool_maxsize: int = 20,
+    retry: bool = False,
+) -> requests.Session:
+    """
+    Build a tool module's keep-alive session: repeated calls to the same host reuse pooled connections
+    instead of paying a TCP + TLS handshake each time. With retry=True, idempotent GETs are retried on
+    transient failures (see _RETRY).
+    """
+    session = requests.Session()
+    if headers:
+        session.headers.update(headers)
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=_RETRY if retry else 0
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def warm_up(session: requests.Session, url: str, params: Optional[Dict[str, Any]] = None) -> threading.Thread:
+    """
+    Open a pooled connection to url in a background thread, so the first real call skips the DNS lookup
+    and TCP + TLS handshake. Failures are ignored; the call will simply connect itself. Never run at
+    import time: the process that hosts the tools decides whether to pay for it.
+    """
+
+    def head() -> None:
+        try:
+            session.head(url, params=params, timeout=5)
+        except Exception:
+            pass
+
+    thread = threading.Thread(target=head, daemon=True)
+    thread.start()
+    return thread
+
+
+# Sentinel returned by TTLCache.get on a miss when None is a cacheable value
+MISS = object()
+
+
+class TTLCache:
+    """
+    Thread-safe in-process cache with per-entry expiry and LRU eviction.
+    Expired entries are dropped lazily on lookup; once over maxsize the least recently used entry goes first.
+    """
+
+    def __init__(self, maxsize: int, ttl_s: float) -> None:
+        self.maxsize = maxsize
+        self.ttl_s = ttl_s
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_s, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent work by key: run(key, fn) calls fn() for the first caller with that key, and
+    callers arriving while it runs wait for and share the same result (or exception).
+    """
+
+    def __init__(self) -> None:
+        self._inflight: "dict[Hashable, Future]" = {}
+        self._lock = threading.Lock()
+
+    def run(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+        future.set_result(result)
+        return result
+
+
+def dumps(obj: Any) -> str:
+    # orjson output is always UTF-8, so it matches json.dumps(..., ensure_ascii=False)
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def loads(data: bytes) -> Any:
+    # Both parsers accept the raw body bytes directly, no text decode step needed
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+_DATE_RE = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}")
+
+
+def is_yyyy_mm_dd(s: str) -> bool:
+    """
+    True if s is a real calendar date written exactly as YYYY-MM-DD.
+    The regex pins the shape (fromisoformat alone also accepts e.g. "20240101");
+    fromisoformat then rejects impossible dates like 2024-02-30.
+    """
+    if not _DATE_RE.fullmatch(s):
+        return False
+    try:
+        date.fromisoformat(s)
+    except ValueError:
+        return False
+    return True
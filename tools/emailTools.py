@@ -1,15 +1,136 @@
+import atexit
 import smtplib
 import imaplib
+import threading
 import time
 from datetime import datetime, date
 from email import message_from_bytes
 from email.header import decode_header
 from email.mime.text import MIMEText
 from email.policy import default
-from email.utils import parsedate_to_datetime
 from config.settings import settings
 from langchain_core.tools import tool
 
+# Idle logged-in SMTP connections by (server, user). Each send checks one out, so concurrent
+# tool calls run on separate sockets and overlap their network waits instead of queueing on a lock.
+_SMTP_POOL = {}
+_SMTP_POOL_MAX_IDLE = 4
+_SMTP_POOL_LOCK = threading.Lock()
+
+
+def _checkoutSMTPConnection(server, user, password):
+    '''
+    Take a live idle SMTP_SSL connection from the pool (dropping any that fail NOOP),
+    or open and log in a new one.
+    '''
+    key = (server, user)
+    while True:
+        with _SMTP_POOL_LOCK:
+            idle = _SMTP_POOL.get(key)
+            conn = idle.pop() if idle else None
+        if conn is None:
+            break
+        try:
+            if conn.noop()[0] == 250:
+                return conn
+        except (smtplib.SMTPException, OSError):
+            pass
+        _closeSMTPConnection(conn)
+    conn = smtplib.SMTP_SSL(server, 465, local_hostname='localhost')
+    conn.login(user, password)
+    return conn
+
+
+def _checkinSMTPConnection(key, conn):
+    with _SMTP_POOL_LOCK:
+        idle = _SMTP_POOL.setdefault(key, [])
+        if len(idle) < _SMTP_POOL_MAX_IDLE:
+            idle.append(conn)
+            return
+    _closeSMTPConnection(conn, quit=True)
+
+
+def _closeSMTPConnection(conn, quit=False):
+    try:
+        if quit:
+            conn.quit()
+        else:
+            conn.close()
+    except (smtplib.SMTPException, OSError):
+        pass
+
+
+@atexit.register
+def _closeSMTPPool():
+    with _SMTP_POOL_LOCK:
+        idle = [conn for conns in _SMTP_POOL.values() for conn in conns]
+        _SMTP_POOL.clear()
+    for conn in idle:
+        _closeSMTPConnection(conn, quit=True)
+
+
+# Longest body returned per email; larger inline bodies are cut rather than handed to the agent whole
+_MAX_BODY_CHARS = 65536
+
+# Idle logged-in IMAP connections as [conn, inbox_selected] pairs, checked out per call like SMTP
+_IMAP_POOL = []
+_IMAP_POOL_MAX_IDLE = 4
+_IMAP_POOL_LOCK = threading.Lock()
+
+
+def _checkoutIMAPConnection():
+    '''
+    Take a live idle IMAP4_SSL connection from the pool (dropping any that fail NOOP),
+    or open and log in a new one. Returns [conn, inbox_selected].
+    '''
+    while True:
+        with _IMAP_POOL_LOCK:
+            entry = _IMAP_POOL.pop() if _IMAP_POOL else None
+        if entry is None:
+            break
+        try:
+            if entry[0].noop()[0] == "OK":
+                return entry
+        except (imaplib.IMAP4.error, OSError):
+            pass
+        _closeIMAPConnection(entry[0])
+    conn = imaplib.IMAP4_SSL(settings.imapServer)
+    conn.login(settings.emailUser, settings.emailPass)
+    return [conn, False]
+
+
+def _selectInbox(entry):
+    '''Select INBOX once per connection; NOOP keeps the selected mailbox's view current.'''
+    if not entry[1]:
+        entry[1] = entry[0].select("INBOX")[0] == "OK"
+
+
+def _checkinIMAPConnection(entry):
+    with _IMAP_POOL_LOCK:
+        if len(_IMAP_POOL) < _IMAP_POOL_MAX_IDLE:
+            _IMAP_POOL.append(entry)
+            return
+    _closeIMAPConnection(entry[0], logout=True)
+
+
+def _closeIMAPConnection(conn, logout=False):
+    try:
+        if logout:
+            conn.logout()
+        else:
+            conn.shutdown()
+    except Exception:
+        pass
+
+
+@atexit.register
+def _closeIMAPPool():
+    with _IMAP_POOL_LOCK:
+        idle = list(_IMAP_POOL)
+        _IMAP_POOL.clear()
+    for conn, _ in idle:
+        _closeIMAPConnection(conn, logout=True)
+
 
 @tool
 def sendEmail(recipientEmail,subject,body,fromWho = 'XiangCheng Xu'):
@@ -32,6 +153,7 @@ def sendEmail(recipientEmail,subject,body,fromWho = 'XiangCheng Xu'):
     '''
     
     numOfRetries = 3
+    poolKey = (settings.smtpServer, settings.emailUser)
     for i in range(numOfRetries):
         try:
             fullBody = body.rstrip() + f"\n\nBest regards,\n{fromWho}"
@@ -39,9 +161,17 @@ def sendEmail(recipientEmail,subject,body,fromWho = 'XiangCheng Xu'):
             MSG['Subject'] = subject
             MSG['From'] = settings.emailUser
             MSG['To'] = recipientEmail
-            with smtplib.SMTP_SSL(settings.smtpServer, 465, local_hostname='localhost') as smtpOBJ:
-                smtpOBJ.login(settings.emailUser, settings.emailPass)
+            smtpOBJ = _checkoutSMTPConnection(settings.smtpServer, settings.emailUser, settings.emailPass)
+            try:
                 smtpOBJ.send_message(MSG)
+            except Exception as e:
+                # Only a dead connection is worth a new TLS + AUTH; keep it for transient send errors
+                if isinstance(e, smtplib.SMTPServerDisconnected) or not isinstance(e, smtplib.SMTPException):
+                    _closeSMTPConnection(smtpOBJ)
+                else:
+                    _checkinSMTPConnection(poolKey, smtpOBJ)
+                raise
+            _checkinSMTPConnection(poolKey, smtpOBJ)
             return 'Email sent successfully.'
         except Exception as e:
             if i<numOfRetries-1:
@@ -70,8 +200,6 @@ def getUnReademail(targetDate: str = None) -> list:
             - date: The date of the email.
             - body: The body of the email.
     '''
-    imapOBJ = imaplib.IMAP4_SSL(settings.imapServer)
-    imapOBJ.login(settings.emailUser, settings.emailPass)
     def _decode_header_value(value):
         if not value:
             return ""
@@ -85,28 +213,30 @@ def getUnReademail(targetDate: str = None) -> list:
         return "".join(decoded_text)
 
     def _extract_body(msg):
-        if msg.is_multipart():
-            for part in msg.walk():
-                content_type = part.get_content_type()
-                content_disposition = str(part.get("Content-Disposition", ""))
-                if content_type == "text/plain" and "attachment" not in content_disposition:
-                    return part.get_content()
-            return ""
-        return msg.get_content()
-
-    def _is_target_date(date_header, target_date):
-        if not date_header:
-            return False
-        try:
-            dt = parsedate_to_datetime(date_header)
-        except Exception:
-            return False
-        if dt.tzinfo is not None:
-            dt = dt.astimezone()
-        return dt.date() == target_date
+        if not msg.is_multipart():
+            return msg.get_content()[:_MAX_BODY_CHARS]
+        # Depth-first in document order like walk(), but stops at the first plain-text part
+        # and only decodes that one
+        stack = [msg]
+        while stack:
+            part = stack.pop()
+            if part.is_multipart():
+                # get_payload() rather than iter_parts() so attached message/rfc822 bodies are still searched
+                stack.extend(reversed(part.get_payload()))
+                continue
+            if part.get_content_type() != "text/plain":
+                continue
+            if "attachment" not in str(part.get("Content-Disposition", "")):
+                return part.get_content()[:_MAX_BODY_CHARS]
+        return ""
 
     try:
-        imapOBJ.select("INBOX")
+        entry = _checkoutIMAPConnection()
+    except Exception:
+        return "Sorry, I couldn't find the email at this time."
+    imapOBJ = entry[0]
+    try:
+        _selectInbox(entry)
         if targetDate:
             try:
                 target_date = datetime.strptime(targetDate, "%Y-%m-%d").date()
@@ -115,22 +245,27 @@ def getUnReademail(targetDate: str = None) -> list:
         else:
             target_date = date.today()
 
-        since_str = target_date.strftime("%d-%b-%Y")
-        status, email_ids = imapOBJ.search(None, f'(SINCE "{since_str}")')
+        # Let the server filter to the exact day instead of re-checking Date headers locally
+        on_str = target_date.strftime("%d-%b-%Y")
+        status, email_ids = imapOBJ.search(None, f'(ON "{on_str}")')
         if status != "OK":
             return "Sorry, I couldn't find the email at this time."
         if not email_ids or not email_ids[0]:
             return []
 
+        # One FETCH for the whole message set rather than one round-trip per message
+        fetch_status, data = imapOBJ.fetch(b",".join(email_ids[0].split()), "(BODY.PEEK[])")
+        if fetch_status != "OK" or not data:
+            return "Sorry, I couldn't find the email at this time."
+
         messages = []
-        for email_id in email_ids[0].split():
-            fetch_status, data = imapOBJ.fetch(email_id, "(BODY.PEEK[])")
-            if fetch_status != "OK" or not data or not data[0]:
+        for item in data:
+            # Message parts come back as (b'<id> (BODY[] {size}', raw) tuples, separated by b')'
+            if not isinstance(item, tuple) or len(item) < 2:
                 continue
-            raw_email = data[0][1]
+            email_id = item[0].split(None, 1)[0]
+            raw_email = item[1]
             msg = message_from_bytes(raw_email, policy=default)
-            if not _is_target_date(msg.get("Date"), target_date):
-                continue
 
             messages.append({
                 "id": email_id.decode("utf-8", errors="replace"),
@@ -142,10 +277,13 @@ def getUnReademail(targetDate: str = None) -> list:
             })
 
         return messages
+    except (imaplib.IMAP4.abort, OSError):
+        # The connection is unusable; close it instead of returning it to the pool
+        _closeIMAPConnection(imapOBJ)
+        entry = None
+        return "Sorry, I couldn't find the email at this time."
     except Exception:
         return "Sorry, I couldn't find the email at this time."
     finally:
-        try:
-            imapOBJ.logout()
-        except Exception:
-            pass
\ No newline at end of file
+        if entry is not None:
+            _checkinIMAPConnection(entry)
@@ -1,28 +1,52 @@
 import yfinance as yf
 
+from .commonUtils import TTLCache
+
+
+# Quotes are reused for a short while: a 24h-change figure tolerates ~30 s of staleness
+QUOTE_TTL_SECONDS = 30
+_QUOTE_CACHE_MAX = 1024
+_quote_cache = TTLCache(maxsize=_QUOTE_CACHE_MAX, ttl_s=QUOTE_TTL_SECONDS)  # symbol -> quote dict
+
 
 def get_market_data(ticker_symbol):
    """
    Fetches the current price and 24h change for a stock or crypto.
    """
+   symbol = ticker_symbol.upper()
+   cached = _cached_quote(symbol)
+   if cached is not None:
+       return cached
    try:
-       ticker = yf.Ticker(ticker_symbol)
-      
-       # .fast_info is quicker for 'real-time' stats than .info
-       info = ticker.fast_info
-      
-       current_price = info['lastPrice']
-       previous_close = info['previousClose']
-      
-       # Calculate percent change
-       change = ((current_price - previous_close) / previous_close) * 100
-      
-       return {
-           "symbol": ticker_symbol.upper(),
-           "price": round(current_price, 2),
-           "change_percent": round(change, 2),
-           "currency": info['currency']
-       }
+       return _store_quote(_quote_from(symbol, yf.Ticker(ticker_symbol)))
    except Exception as e:
        return {"error": f"Could not find data for {ticker_symbol}. {str(e)}"}
 
+
+def _quote_from(symbol, ticker):
+   # .fast_info is quicker for 'real-time' stats than .info
+   info = ticker.fast_info
+
+   current_price = info['lastPrice']
+   previous_close = info['previousClose']
+
+   # Calculate percent change
+   change = ((current_price - previous_close) / previous_close) * 100
+
+   return {
+       "symbol": symbol,
+       "price": round(current_price, 2),
+       "change_percent": round(change, 2),
+       "currency": info['currency']
+   }
+
+
+def _cached_quote(symbol):
+   quote = _quote_cache.get(symbol)
+   return None if quote is None else dict(quote)
+
+
+def _store_quote(quote):
+   # Only successful quotes are cached, so a failed lookup is retried on the next call
+   _quote_cache.put(quote["symbol"], quote)
+   return dict(quote)
@@ -1,6 +1,6 @@
-from tavily import TavilyClient
-from config.settings import settings
+from concurrent.futures import ThreadPoolExecutor
 from langchain_core.tools import tool
+from .webSearch import getTavilyClient
 
 @tool
 def dailyNewsSearch(query) -> str:
@@ -16,7 +16,7 @@ def dailyNewsSearch(query) -> str:
             - title: The title of the news.
             - content: The content of the news.
     '''
-    tavily_client = TavilyClient(api_key=settings.tavilyApiKey)
+    tavily_client = getTavilyClient()
     response = tavily_client.search(query,topic="news",time_range="day")
     return response
 
@@ -32,10 +32,15 @@ def startingNewsSearch(topics: list[str]) -> str:
             - title: The title of the news.
             - content: The content of the news.
     '''
-    tavily_client = TavilyClient(api_key=settings.tavilyApiKey)
+    tavily_client = getTavilyClient()
+    if not topics:
+        return []
+    # Search all topics concurrently; map() keeps results in topic order
+    with ThreadPoolExecutor(max_workers=min(16, len(topics))) as executor:
+        responses = list(executor.map(
+            lambda topic: tavily_client.search(topic,topic="news",time_range="day"), topics))
     context = []
-    for topic in topics:
-        response = tavily_client.search(topic,topic="news",time_range="day")
+    for topic, response in zip(topics, responses):
         context.append({
             "topic": topic,
             "context":[{
@@ -2,18 +2,29 @@
 
 from __future__ import annotations
 
-import json
+import functools
+import re
 from typing import Any, Dict, List, Optional, Tuple
 
-import requests
 from langchain_core.tools import tool
 
 from config.settings import settings
 
+from .commonUtils import MISS, TTLCache, dumps, loads, make_session
 
+try:
+    import h2  # noqa: F401  (httpx needs it for http2=True)
+    import httpx
+except ImportError:
+    # httpx is optional; fall back to a requests session
+    httpx = None
+
+
+@functools.lru_cache(maxsize=1)
 def _get_base_url() -> str:
     """
     Read base URL from settings if present; otherwise use default Open Library.
+    Cached after the first call, since settings do not change at runtime.
     """
     base_url = (
         getattr(settings, "openLibraryApiBaseUrl", None)
@@ -33,13 +44,39 @@ def _validate_timeout(timeout_s: int) -> Optional[str]:
     return None
 
 
+_HEADERS = {
+    "User-Agent": "corque-plugin/1.0 (Open Library tool)",
+    "Accept": "application/json",
+}
+
+# With httpx + h2 installed, concurrent calls are multiplexed over one HTTP/2 connection.
+if httpx is not None:
+    _SESSION = httpx.Client(
+        http2=True,
+        headers=_HEADERS,
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=16, max_keepalive_connections=4),
+    )
+else:
+    _SESSION = make_session(_HEADERS, pool_connections=4, pool_maxsize=16)
+
+
+# Successful responses by (url, sorted params); Open Library search and ISBN records change rarely
+_RESPONSE_CACHE = TTLCache(maxsize=256, ttl_s=300)
+
+
+def _cache_key(url: str, params: Dict[str, Any]) -> Tuple[Any, ...]:
+    return (url, tuple(sorted(params.items())))
+
+
 def _request_json(url: str, params: Dict[str, Any], timeout_s: int) -> Tuple[Optional[Any], Optional[str]]:
-    headers = {
-        "User-Agent": "corque-plugin/1.0 (Open Library tool)",
-        "Accept": "application/json",
-    }
+    key = _cache_key(url, params)
+    cached = _RESPONSE_CACHE.get(key, MISS)
+    if cached is not MISS:
+        return cached, None
+
     try:
-        resp = requests.get(url, params=params, headers=headers, timeout=timeout_s)
+        resp = _SESSION.get(url, params=params, timeout=timeout_s)
     except Exception as e:
         return None, f"request error: {str(e)}"
 
@@ -47,9 +84,29 @@ def _request_json(url: str, params: Dict[str, Any], timeout_s: int) -> Tuple[Opt
         return None, f"http {resp.status_code}: {(resp.text or '')[:300]}"
 
     try:
-        return resp.json(), None
+        payload = loads(resp.content)
     except Exception:
         return None, "failed to parse json response"
+    _RESPONSE_CACHE.put(key, payload)
+    return payload, None
+
+
+# Fields read by _search_result. Passed as the search `fields` parameter so Open Library returns
+# only these instead of every field of every doc, which shrinks the body and the parsed payload
+_SEARCH_FIELDS = "title,author_name,first_publish_year,isbn,edition_key,key,cover_i"
+
+
+def _search_result(d: Dict[str, Any]) -> Dict[str, Any]:
+    # Bind the lookup once instead of resolving d.get for each of the fields
+    get = d.get
+    return {
+        "title": get("title"),
+        "author_name": get("author_name"),
+        "first_publish_year": get("first_publish_year"),
+        "isbn": get("isbn"),
+        "olid": get("edition_key") or get("key"),
+        "cover_i": get("cover_i"),
+    }
 
 
 @tool
@@ -82,7 +139,7 @@ def openlibrary_search_books(query: str, limit: int = 10, page: int = 1, timeout
 
     base = _get_base_url()
     url = f"{base}/search.json"
-    params = {"q": query.strip(), "limit": int(limit), "page": int(page)}
+    params = {"q": query.strip(), "limit": int(limit), "page": int(page), "fields": _SEARCH_FIELDS}
 
     payload, e = _request_json(url, params=params, timeout_s=timeout_s)
     if e:
@@ -93,19 +150,7 @@ def openlibrary_search_books(query: str, limit: int = 10, page: int = 1, timeout
     docs = payload.get("docs", [])
     results: List[Dict[str, Any]] = []
     if isinstance(docs, list):
-        for d in docs:
-            if not isinstance(d, dict):
-                continue
-            results.append(
-                {
-                    "title": d.get("title"),
-                    "author_name": d.get("author_name"),
-                    "first_publish_year": d.get("first_publish_year"),
-                    "isbn": d.get("isbn"),
-                    "olid": d.get("edition_key") or d.get("key"),
-                    "cover_i": d.get("cover_i"),
-                }
-            )
+        results = [_search_result(d) for d in docs if isinstance(d, dict)]
 
     out = {
         "query": {"q": query.strip(), "limit": int(limit), "page": int(page), "base_url": base},
@@ -115,11 +160,19 @@ def openlibrary_search_books(query: str, limit: int = 10, page: int = 1, timeout
     }
 
     try:
-        return json.dumps(out, ensure_ascii=False)
+        return dumps(out)
     except Exception as ex:
         return f"Error: failed to serialize result to JSON. {str(ex)}"
 
 
+# Anything that is not an ISBN digit or check character (hyphens, spaces, ...) is a separator
+_ISBN_STRIP = re.compile(r"[^0-9Xx]")
+
+
+def _clean_isbn(isbn: str) -> str:
+    return _ISBN_STRIP.sub("", isbn.strip()).upper()
+
+
 @tool
 def openlibrary_isbn_lookup(isbn: str, timeout_s: int = 12) -> str:
     """
@@ -141,7 +194,7 @@ def openlibrary_isbn_lookup(isbn: str, timeout_s: int = 12) -> str:
     if not isinstance(isbn, str) or not isbn.strip():
         return "Error: isbn must be a non-empty string."
 
-    cleaned = "".join(ch for ch in isbn.strip() if ch.isdigit() or ch.upper() == "X")
+    cleaned = _clean_isbn(isbn)
     if len(cleaned) not in (10, 13):
         return "Error: isbn must be 10 or 13 characters after removing separators."
 
@@ -161,6 +214,65 @@ def openlibrary_isbn_lookup(isbn: str, timeout_s: int = 12) -> str:
         return f"Error: no Open Library record found for ISBN {cleaned}."
 
     try:
-        return json.dumps({"isbn_input": isbn.strip(), "isbn": cleaned, "data": data}, ensure_ascii=False)
+        return dumps({"isbn_input": isbn.strip(), "isbn": cleaned, "data": data})
     except Exception as ex:
-        return f"Error: failed to serialize result to JSON. {str(ex)}"
\ No newline at end of file
+        return f"Error: failed to serialize result to JSON. {str(ex)}"
+
+
+@tool
+def openlibrary_isbn_lookup_batch(isbns: List[str], timeout_s: int = 12) -> str:
+    """
+    Lookup book metadata for several ISBNs at once using Open Library Books API (no-auth).
+    Use this tool instead of calling openlibrary_isbn_lookup repeatedly when the user has more than one ISBN:
+    all ISBNs are fetched in a single request.
+
+    Args:
+        isbns (List[str]): Required. 1-50 ISBN-10 or ISBN-13 strings. Hyphens/spaces allowed.
+        timeout_s (int): Optional. HTTP timeout seconds (3-30). Default 12.
+
+    Returns:
+        str: JSON string {"count":N,"results":[{"isbn_input":..., "isbn":..., "data":{...}}, ...],"not_found":[...]}.
+             Results keep the input order; duplicate ISBNs are looked up once.
+             On failure returns "Error: ...".
+    """
+    err = _validate_timeout(timeout_s)
+    if err:
+        return err
+
+    if not isinstance(isbns, list) or not isbns or len(isbns) > 50:
+        return "Error: isbns must be a list of 1 to 50 ISBN strings."
+
+    # cleaned ISBN -> original input, in first-seen order
+    by_isbn: Dict[str, str] = {}
+    for isbn in isbns:
+        if not isinstance(isbn, str) or not isbn.strip():
+            return "Error: each isbn must be a non-empty string."
+        cleaned = _clean_isbn(isbn)
+        if len(cleaned) not in (10, 13):
+            return f"Error: isbn '{isbn}' must be 10 or 13 characters after removing separators."
+        by_isbn.setdefault(cleaned, isbn.strip())
+
+    base = _get_base_url()
+    url = f"{base}/api/books"
+    bibkeys = ",".join(f"ISBN:{cleaned}" for cleaned in by_isbn)
+    params = {"bibkeys": bibkeys, "format": "json", "jscmd": "data"}
+
+    payload, e = _request_json(url, params=params, timeout_s=timeout_s)
+    if e:
+        return f"Error: failed to fetch Open Library ISBN data. {e}"
+    if not isinstance(payload, dict):
+        return "Error: unexpected Open Library response format."
+
+    results: List[Dict[str, Any]] = []
+    not_found: List[str] = []
+    for cleaned, isbn_input in by_isbn.items():
+        data = payload.get(f"ISBN:{cleaned}")
+        if data:
+            results.append({"isbn_input": isbn_input, "isbn": cleaned, "data": data})
+        else:
+            not_found.append(cleaned)
+
+    try:
+        return dumps({"count": len(results), "results": results, "not_found": not_found})
+    except Exception as ex:
+        return f"Error: failed to serialize result to JSON. {str(ex)}"
@@ -3,20 +3,22 @@
 from __future__ import annotations
 
 import csv
-import io
-import json
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+import functools
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
-import requests
 from langchain_core.tools import tool
 
 from config.settings import settings
 
+from .commonUtils import MISS, TTLCache, dumps, is_yyyy_mm_dd, make_session
 
+
+@functools.lru_cache(maxsize=1)
 def _get_base_url() -> str:
     """
     Read base URL from settings if present; otherwise use default Stooq.
+    Cached after the first call, since settings do not change at runtime.
     """
     base_url = getattr(settings, "stooqApiBaseUrl", None) or getattr(settings, "stooq_base_url", None)
     if isinstance(base_url, str) and base_url.strip():
@@ -36,123 +38,183 @@ def _validate_date_yyyy_mm_dd(date_str: str, field: str) -> Optional[str]:
     if not isinstance(date_str, str) or not date_str.strip():
         return f"Error: {field} must be a non-empty string in YYYY-MM-DD format."
     s = date_str.strip()
-    try:
-        datetime.strptime(s, "%Y-%m-%d")
-    except Exception:
+    if not is_yyyy_mm_dd(s):
         return f"Error: {field} must be in YYYY-MM-DD format (got '{date_str}')."
     return None
 
 
-def _request_text(url: str, params: Dict[str, Any], timeout_s: int) -> Tuple[Optional[str], Optional[str]]:
-    headers = {
+# Accept-Encoding is left to the client default (gzip, deflate, plus br when brotli is installed), so
+# the CSV is already compressed on the wire; pinning it here would only drop br.
+_SESSION = make_session(
+    {
         "User-Agent": "corque-plugin/1.0 (Stooq tool)",
         "Accept": "text/csv,*/*",
-    }
+    },
+    pool_connections=4,
+    pool_maxsize=16,
+)
+
+
+# Successful responses by (url, sorted params); the TTL is short since the latest bar still moves
+# during a trading session
+_RESPONSE_CACHE = TTLCache(maxsize=256, ttl_s=60)
+
+
+def _cache_key(url: str, params: Dict[str, Any]) -> Tuple[Any, ...]:
+    return (url, tuple(sorted(params.items())))
+
+
+def _request_text(url: str, params: Dict[str, Any], timeout_s: int) -> Tuple[Optional[str], Optional[str]]:
+    key = _cache_key(url, params)
+    cached = _RESPONSE_CACHE.get(key, MISS)
+    if cached is not MISS:
+        return cached, None
+
     try:
-        resp = requests.get(url, params=params, headers=headers, timeout=timeout_s)
+        resp = _SESSION.get(url, params=params, timeout=timeout_s)
     except Exception as e:
         return None, f"request error: {str(e)}"
 
     if resp.status_code != 200:
         return None, f"http {resp.status_code}: {(resp.text or '')[:300]}"
 
+    _RESPONSE_CACHE.put(key, resp.text)
     return resp.text, None
 
 
-def _parse_stooq_csv(csv_text: str) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+def _iter_lines(text: str) -> Iterator[str]:
     """
-    Parse Stooq historical CSV (Date,Open,High,Low,Close,Volume).
+    Yield the lines of `text` one at a time, without copying the whole body.
     """
-    if not csv_text or not isinstance(csv_text, str):
-        return [], "empty csv response"
-
-    f = io.StringIO(csv_text)
-    reader = csv.DictReader(f)
+    start = 0
+    find = text.find
+    while True:
+        end = find("\n", start)
+        if end < 0:
+            if start < len(text):
+                yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
+
+def _parse_stooq_csv(
+    lines: Iterable[str],
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    keep_last: Optional[int] = None,
+) -> Tuple[List[Dict[str, Any]], int, Optional[str]]:
+    """
+    Parse Stooq historical CSV (Date,Open,High,Low,Close,Volume) from an iterable of lines.
+    Rows outside [start_date, end_date] are skipped before any numeric conversion, and only the
+    last `keep_last` matching rows are converted. Returns (rows, matched, error), where matched
+    counts every row in the date range before truncation.
+    """
+    reader = csv.reader(lines)
     rows: List[Dict[str, Any]] = []
 
-    def _to_float(x: Any) -> Optional[float]:
+    header = next(reader, None)
+    if header is None:
+        return [], 0, "empty csv response"
+    if "Date" not in header:
+        return [], 0, "no rows parsed (symbol may be invalid or no data)"
+
+    # Column positions are looked up once. A column the header lacks (e.g. Volume for some
+    # FX/index symbols) points at a blank cell appended past the end of every row.
+    width = len(header)
+    i_date, i_open, i_high, i_low, i_close, i_vol = (
+        header.index(name) if name in header else width
+        for name in ("Date", "Open", "High", "Low", "Close", "Volume")
+    )
+    blank = [""] * (width + 1)
+    _float = float
+    _int = int
+
+    def _to_float(x: str) -> Optional[float]:
+        s = x.strip()
+        if not s or s.lower() == "null":
+            return None
         try:
-            if x is None:
-                return None
-            s = str(x).strip()
-            if not s or s.lower() == "null":
-                return None
-            return float(s)
-        except Exception:
+            return _float(s)
+        except ValueError:
             return None
 
-    def _to_int(x: Any) -> Optional[int]:
+    def _to_int(x: str) -> Optional[int]:
+        v = _to_float(x)
+        if v is None:
+            return None
         try:
-            if x is None:
-                return None
-            s = str(x).strip()
-            if not s or s.lower() == "null":
-                return None
-            return int(float(s))
-        except Exception:
+            return _int(v)
+        except (ValueError, OverflowError):
             return None
 
+    # Stooq typically returns oldest->newest, so the tail of the deque is the most recent data
+    kept: deque = deque(maxlen=keep_last)
+    parsed_any = False
+    matched = 0
     for r in reader:
-        if not isinstance(r, dict):
-            continue
-        date = (r.get("Date") or "").strip()
+        if len(r) <= width:
+            r.extend(blank[len(r):])
+        else:
+            r = r[:width]
+            r.append("")
+        date = r[i_date].strip()
         if not date:
             continue
+        parsed_any = True
+        if (start_date and date < start_date) or (end_date and date > end_date):
+            continue
+        matched += 1
+        kept.append((date, r))
 
+    if not parsed_any:
+        return [], 0, "no rows parsed (symbol may be invalid or no data)"
+
+    for date, r in kept:
         rows.append(
             {
                 "date": date,
-                "open": _to_float(r.get("Open")),
-                "high": _to_float(r.get("High")),
-                "low": _to_float(r.get("Low")),
-                "close": _to_float(r.get("Close")),
-                "volume": _to_int(r.get("Volume")),
+                "open": _to_float(r[i_open]),
+                "high": _to_float(r[i_high]),
+                "low": _to_float(r[i_low]),
+                "close": _to_float(r[i_close]),
+                "volume": _to_int(r[i_vol]),
             }
         )
+    return rows, matched, None
 
-    if not rows:
-        return [], "no rows parsed (symbol may be invalid or no data)"
-    return rows, None
 
-
-def _filter_rows_by_date(
-    rows: List[Dict[str, Any]], start_date: Optional[str], end_date: Optional[str]
-) -> List[Dict[str, Any]]:
-    if not start_date and not end_date:
-        return rows
-
-    def _in_range(d: str) -> bool:
-        if start_date and d < start_date:
-            return False
-        if end_date and d > end_date:
-            return False
-        return True
-
-    return [r for r in rows if isinstance(r.get("date"), str) and _in_range(r["date"])]
+_TICKS = "▁▂▃▄▅▆▇█"
 
 
 def _sparkline(values: List[Optional[float]]) -> Optional[str]:
     """
     Unicode sparkline with 8 levels. Missing values -> '·'.
     """
-    clean = [v for v in values if isinstance(v, (int, float))]
-    if len(clean) < 2:
+    # One pass for count/min/max (no filtered copy of the series), one pass to map values to ticks
+    count = 0
+    mn = mx = 0.0
+    for v in values:
+        if isinstance(v, (int, float)):
+            if count == 0:
+                mn = mx = v
+            elif v < mn:
+                mn = v
+            elif v > mx:
+                mx = v
+            count += 1
+    if count < 2:
         return None
 
-    mn, mx = min(clean), max(clean)
     if mx == mn:
         return "▁" * len(values)
 
-    ticks = "▁▂▃▄▅▆▇█"
-    out: List[str] = []
-    for v in values:
-        if not isinstance(v, (int, float)):
-            out.append("·")
-            continue
-        idx = int((v - mn) / (mx - mn) * (len(ticks) - 1))
-        idx = max(0, min(len(ticks) - 1, idx))
-        out.append(ticks[idx])
-    return "".join(out)
+    # Every value lies in [mn, mx], so (v - mn) / span is in [0, 1] and the index needs no clamping
+    ticks = _TICKS
+    top = len(ticks) - 1
+    span = mx - mn
+    number = (int, float)
+    return "".join([ticks[int((v - mn) / span * top)] if isinstance(v, number) else "·" for v in values])
 
 
 @tool
@@ -227,21 +289,18 @@ def stooq_get_history(
     if e:
         return f"Error: failed to fetch Stooq CSV. {e}"
 
-    rows, e2 = _parse_stooq_csv(csv_text)
+    # Date filtering and the limit are applied while parsing, so dropped rows are never converted
+    rows, matched, e2 = _parse_stooq_csv(_iter_lines(csv_text), start_date, end_date, keep_last=limit)
     if e2:
         return f"Error: failed to parse Stooq CSV. {e2}"
 
-    rows = _filter_rows_by_date(rows, start_date, end_date)
-
     if not rows:
         return "Error: no data after applying date filters."
 
     warnings: List[str] = []
 
-    # Stooq typically returns oldest->newest
-    if len(rows) > limit:
-        warnings.append(f"Truncated results from {len(rows)} to limit={limit}.")
-        rows = rows[-limit:]  # keep most recent
+    if matched > limit:
+        warnings.append(f"Truncated results from {matched} to limit={limit}.")
 
     spark = None
     if include_sparkline:
@@ -263,6 +322,6 @@ def stooq_get_history(
     }
 
     try:
-        return json.dumps(out, ensure_ascii=False)
+        return dumps(out)
     except Exception as ex:
         return f"Error: failed to serialize result to JSON. {str(ex)}"
\ No newline at end of file
@@ -1,25 +1,61 @@
 import sqlite3
+import threading
 import time
 from langchain_core.tools import tool
 from config.settings import settings
 from .timeTools import convertISOToUTCEpoch, getUTCNow, convertUTCEpochToISO, convertUTCToLocal
 
+# One connection shared by every tool call, opened on first use. It runs in autocommit mode
+# (isolation_level=None) with WAL journaling; _CONN_LOCK serializes access across threads.
+_CONN = None
+_CONN_LOCK = threading.Lock()
+
+# Columns read back by the query tools; rows are sqlite3.Row so they are accessed by name
+_TODO_COLUMNS = 'id, title, description, status, createdAtUTC, dueAtUTC'
+
+# Each tool issues one fixed SQL string, so the connection's statement cache reuses the prepared
+# statement instead of re-parsing the SQL on every call
+_SQL_INSERT_TODO = '''INSERT INTO todoList (title, description, status, createdAtUTC, dueAtUTC)
+        VALUES (?, ?, 'pending', ?, ?)'''
+_SQL_SELECT_DUE_RANGE = f'''SELECT {_TODO_COLUMNS} FROM todoList
+        WHERE dueAtUTC BETWEEN ? AND ?
+        ORDER BY dueAtUTC ASC'''
+_SQL_SELECT_NEXT_PENDING = f'''SELECT {_TODO_COLUMNS} FROM todoList WHERE status = 'pending' ORDER BY dueAtUTC ASC LIMIT ?'''
+_SQL_COMPLETE_TODO = '''UPDATE todoList SET status = 'completed' WHERE id = ?'''
+_SQL_SET_TODO_STATUS = '''UPDATE todoList SET status = ? WHERE id = ?'''
+
+
+def _getConnection():
+    '''
+    Return the shared connection, opening it on first use. Caller must hold _CONN_LOCK.
+    '''
+    global _CONN
+    if _CONN is None:
+        conn = sqlite3.connect(settings.dataBasePath, check_same_thread=False, isolation_level=None,
+                               cached_statements=256)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.row_factory = sqlite3.Row
+        _CONN = conn
+    return _CONN
 
 
 def initTodoList():
-    conn = sqlite3.connect(settings.dataBasePath)
-    cur = conn.cursor()
-    cur.execute('''
-    CREATE TABLE IF NOT EXISTS todoList (
-    id integer primary key not null,
-    title text not null,
-    description text null,
-    status text not null default 'pending',
-    createdAtUTC INT not null,
-    dueAtUTC INT null);
-    ''')
-    conn.commit()
-    conn.close()
+    with _CONN_LOCK:
+        conn = _getConnection()
+        conn.execute('''
+        CREATE TABLE IF NOT EXISTS todoList (
+        id integer primary key not null,
+        title text not null,
+        description text null,
+        status text not null default 'pending',
+        createdAtUTC INT not null,
+        dueAtUTC INT null);
+        ''')
+        # getMostRecentTodo filters on status and orders by due date; getTodoListinDaysFromNow ranges over due date
+        conn.execute('''CREATE INDEX IF NOT EXISTS idx_todo_due ON todoList(status, dueAtUTC)''')
+        conn.execute('''CREATE INDEX IF NOT EXISTS idx_todo_due_at ON todoList(dueAtUTC)''')
 
 def getCurrentUTCEpoch():
     return time.time()
@@ -53,13 +89,9 @@ def addTodo(title, dueDate, description=None) -> str:
     Raises:
         Exception: Propagates database or parsing errors (caller may catch and respond).
     '''
-    conn = sqlite3.connect(settings.dataBasePath)
-    cur = conn.cursor()
-    cur.execute('''INSERT INTO todoList (title, description, status, createdAtUTC, dueAtUTC)
-    VALUES (?, ?, 'pending', ?, ?)
-    ''',(title, description, getCurrentUTCEpoch(), getDueDateUTCEpoch(dueDate)))
-    conn.commit()
-    conn.close()
+    dueAtUTC = getDueDateUTCEpoch(dueDate)
+    with _CONN_LOCK:
+        _getConnection().execute(_SQL_INSERT_TODO,(title, description, getCurrentUTCEpoch(), dueAtUTC))
     return "Task added successfully."
 
 @tool
@@ -76,27 +108,28 @@ def getTodoListinDaysFromNow(days) -> list:
     Returns:
         list: A list of todo list with the due date in local time string.
     '''
-    conn = sqlite3.connect(settings.dataBasePath)
-    cur = conn.cursor()
+    try:
+        # The model may pass days as a string such as "7"
+        days = float(days)
+    except (TypeError, ValueError):
+        return f'Error: days must be a number, got {days!r}.'
     currentUTCEpoch = getCurrentUTCEpoch()
-    cur.execute('''SELECT * FROM todoList 
-    WHERE dueAtUTC IS NOT NULL AND dueAtUTC-?<=?*24*60*60 AND dueAtUTC>=? 
-    ORDER BY dueAtUTC ASC''',(currentUTCEpoch,days,currentUTCEpoch))
-    todoList = cur.fetchall()
+    # Bounds are computed here so the predicate is a plain range on dueAtUTC and can use idx_todo_due_at
+    upperUTCEpoch = currentUTCEpoch + days * 24 * 60 * 60
+    with _CONN_LOCK:
+        todoList = _getConnection().execute(_SQL_SELECT_DUE_RANGE,(currentUTCEpoch,upperUTCEpoch)).fetchall()
     if len(todoList) == 0:
-        conn.close()
         return "No todo list found."
     else:
-        conn.close()
         localTodoList = []
         for todo in todoList:
-            localTodoList.append({'id': todo[0], 
-                                'title': todo[1], 
-                                'description': todo[2],
-                                'status': todo[3], 
-                                'dueAtLocal': convertUTCToLocal(convertUTCEpochToISO(todo[5]), localTimeZone=settings.localTimeZone),
-                                'createdAtLocal': convertUTCToLocal(convertUTCEpochToISO(todo[4]), localTimeZone=settings.localTimeZone),
-                                'daysFromNow': (todo[5] - currentUTCEpoch) / (24 * 60 * 60)})
+            localTodoList.append({'id': todo['id'], 
+                                'title': todo['title'], 
+                                'description': todo['description'],
+                                'status': todo['status'], 
+                                'dueAtLocal': convertUTCToLocal(convertUTCEpochToISO(todo['dueAtUTC']), localTimeZone=settings.localTimeZone),
+                                'createdAtLocal': convertUTCToLocal(convertUTCEpochToISO(todo['createdAtUTC']), localTimeZone=settings.localTimeZone),
+                                'daysFromNow': (todo['dueAtUTC'] - currentUTCEpoch) / (24 * 60 * 60)})
         return localTodoList
 
 @tool
@@ -110,68 +143,55 @@ def getMostRecentTodo(numberOfTodos:int=2) -> list:
     Returns:
         list: A list of todo list with the due date in local time string.
     '''
-    conn = sqlite3.connect(settings.dataBasePath)
-    cur = conn.cursor()
-    cur.execute('''SELECT * FROM todoList WHERE status = 'pending' ORDER BY dueAtUTC ASC LIMIT ?''',(numberOfTodos,))
-    todoList = cur.fetchall()
+    with _CONN_LOCK:
+        todoList = _getConnection().execute(_SQL_SELECT_NEXT_PENDING,(numberOfTodos,)).fetchall()
     if len(todoList) == 0:
-        conn.close()
         return "No todo list found."
     else:
-        conn.close()
         localTodoList = []
         for todo in todoList:
-            localTodoList.append({'id': todo[0],
-                                'title': todo[1],
-                                'description': todo[2],
-                                'status': todo[3],
-                                'dueAtLocal': convertUTCToLocal(convertUTCEpochToISO(todo[5]), localTimeZone=settings.localTimeZone),
-                                'createdAtLocal': convertUTCToLocal(convertUTCEpochToISO(todo[4]), localTimeZone=settings.localTimeZone),
-                                'daysFromNow': (todo[5] - getCurrentUTCEpoch()) / (24 * 60 * 60)})
+            localTodoList.append({'id': todo['id'],
+                                'title': todo['title'],
+                                'description': todo['description'],
+                                'status': todo['status'],
+                                'dueAtLocal': convertUTCToLocal(convertUTCEpochToISO(todo['dueAtUTC']), localTimeZone=settings.localTimeZone),
+                                'createdAtLocal': convertUTCToLocal(convertUTCEpochToISO(todo['createdAtUTC']), localTimeZone=settings.localTimeZone),
+                                'daysFromNow': (todo['dueAtUTC'] - getCurrentUTCEpoch()) / (24 * 60 * 60)})
         return localTodoList
 
 @tool
-def deleteTodo(todoId) -> str:
+def deleteTodo(todoId, confirm: bool = False) -> str:
     '''
     Delete a todo from the todo list. Or mark a todo as completed.
     The todo is deleted from the todo list database.
+    Ask the user to confirm first, then call again with `confirm=True`; without it nothing is changed.
     Args:
         todoId (int): The id of the todo to delete.
+        confirm (bool): Whether the user has confirmed the deletion. Default is False.
     Returns:
-        str: A confirmation message if the todo is deleted successfully.
+        str: A confirmation message if the todo is deleted successfully, or an error asking for confirmation.
     '''
-    conn = sqlite3.connect(settings.dataBasePath)
-    cur = conn.cursor()
-    cur.execute('''UPDATE todoList SET status = 'completed' WHERE id = ?''',(todoId,))
-    print('Are your sure you want to delete the todo?')
-    confirmation = input('Enter y to confirm, n to cancel: ')
-    if confirmation in ('y', 'Y', 'yes', 'Yes', 'YES'):
-        conn.commit()
-        conn.close()
-        return 'Todo deleted successfully.'
-    else:
-        conn.close()
-        return 'Todo deletion cancelled.'
+    if not confirm:
+        return 'Error: confirmation required; ask the user, then re-call with confirm=True.'
+    with _CONN_LOCK:
+        _getConnection().execute(_SQL_COMPLETE_TODO,(todoId,))
+    return 'Todo deleted successfully.'
 
 @tool
-def changeTodoStatus(todoId, status) -> str:
+def changeTodoStatus(todoId, status, confirm: bool = False) -> str:
     '''
     Change the status of a todo.
     The status is changed in the todo list database.
+    Ask the user to confirm first, then call again with `confirm=True`; without it nothing is changed.
     Args:
         todoId (int): The id of the todo to change the status.
         status (str): The status to change to.
+        confirm (bool): Whether the user has confirmed the change. Default is False.
     Returns:
-        str: A confirmation message if the status is changed successfully.
+        str: A confirmation message if the status is changed successfully, or an error asking for confirmation.
     '''
-    print('Are your sure you want to change the status of the todo?')
-    confirmation = input('Enter y to confirm, n to cancel: ')
-    if confirmation in ('y', 'Y', 'yes', 'Yes', 'YES'):
-        conn = sqlite3.connect(settings.dataBasePath)
-        cur = conn.cursor()
-        cur.execute('''UPDATE todolist SET status = ? WHERE id = ?''',(status,todoId))
-        conn.commit()
-        conn.close()
-        return 'Todo status changed successfully.'
-    else:
-        return 'Todo status change cancelled.'
\ No newline at end of file
+    if not confirm:
+        return 'Error: confirmation required; ask the user, then re-call with confirm=True.'
+    with _CONN_LOCK:
+        _getConnection().execute(_SQL_SET_TODO_STATUS,(status,todoId))
+    return 'Todo status changed successfully.'
@@ -2,19 +2,29 @@
 
 from __future__ import annotations
 
-import json
-from datetime import datetime
+import functools
+import time
 from typing import Any, Dict, List, Optional, Tuple
 
-import requests
 from langchain_core.tools import tool
 
 from config.settings import settings
 
+from .commonUtils import MISS, TTLCache, dumps, is_yyyy_mm_dd, loads, make_session
 
+try:
+    import h2  # noqa: F401  (httpx needs it for http2=True)
+    import httpx
+except ImportError:
+    # httpx is optional; fall back to a requests session
+    httpx = None
+
+
+@functools.lru_cache(maxsize=1)
 def _get_base_url() -> str:
     """
     Read base URL from settings if present; otherwise use default USGS Earthquake Catalog endpoint root.
+    Cached after the first call, since settings do not change at runtime.
     """
     base_url = (
         getattr(settings, "usgsEarthquakeApiBaseUrl", None)
@@ -38,20 +48,47 @@ def _validate_iso_date(date_str: str, field_name: str) -> Optional[str]:
     if not isinstance(date_str, str) or not date_str.strip():
         return f"Error: {field_name} must be a non-empty string in YYYY-MM-DD format."
     s = date_str.strip()
-    try:
-        datetime.strptime(s, "%Y-%m-%d")
-    except Exception:
+    if not is_yyyy_mm_dd(s):
         return f"Error: {field_name} must be in YYYY-MM-DD format (got '{date_str}')."
     return None
 
 
+# Accept-Encoding is left to the client default (gzip, deflate, plus br when brotli is installed), so
+# the GeoJSON is already compressed on the wire; pinning it here would only drop br.
+_HEADERS = {
+    "User-Agent": "corque-plugin/1.0 (USGS Earthquake tool)",
+    "Accept": "application/json",
+}
+
+# With httpx + h2 installed, concurrent calls are multiplexed over one HTTP/2 connection.
+if httpx is not None:
+    _SESSION = httpx.Client(
+        http2=True,
+        headers=_HEADERS,
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=16, max_keepalive_connections=4),
+    )
+else:
+    _SESSION = make_session(_HEADERS, pool_connections=4, pool_maxsize=16)
+
+
+# Successful responses by (url, sorted params); the catalog for a fixed date range rarely changes
+# within minutes
+_RESPONSE_CACHE = TTLCache(maxsize=256, ttl_s=120)
+
+
+def _cache_key(url: str, params: Dict[str, Any]) -> Tuple[Any, ...]:
+    return (url, tuple(sorted(params.items())))
+
+
 def _request_json(url: str, params: Dict[str, Any], timeout_s: int) -> Tuple[Optional[Any], Optional[str]]:
-    headers = {
-        "User-Agent": "corque-plugin/1.0 (USGS Earthquake tool)",
-        "Accept": "application/json",
-    }
+    key = _cache_key(url, params)
+    cached = _RESPONSE_CACHE.get(key, MISS)
+    if cached is not MISS:
+        return cached, None
+
     try:
-        resp = requests.get(url, params=params, headers=headers, timeout=timeout_s)
+        resp = _SESSION.get(url, params=params, timeout=timeout_s)
     except Exception as e:
         return None, f"request error: {str(e)}"
 
@@ -59,16 +96,23 @@ def _request_json(url: str, params: Dict[str, Any], timeout_s: int) -> Tuple[Opt
         return None, f"http {resp.status_code}: {(resp.text or '')[:300]}"
 
     try:
-        return resp.json(), None
+        payload = loads(resp.content)
     except Exception:
         return None, "failed to parse json response"
+    _RESPONSE_CACHE.put(key, payload)
+    return payload, None
 
 
 def _ms_to_iso_utc(ms: Optional[int]) -> Optional[str]:
     if ms is None:
         return None
+    # time.gmtime is a direct C call; no datetime object or strftime format parsing per event
     try:
-        return datetime.utcfromtimestamp(ms / 1000.0).strftime("%Y-%m-%dT%H:%M:%SZ")
+        tm = time.gmtime(ms // 1000)
+        return (
+            f"{tm.tm_year:04d}-{tm.tm_mon:02d}-{tm.tm_mday:02d}"
+            f"T{tm.tm_hour:02d}:{tm.tm_min:02d}:{tm.tm_sec:02d}Z"
+        )
     except Exception:
         return None
 
@@ -201,6 +245,6 @@ def usgs_earthquake_search(
     }
 
     try:
-        return json.dumps(out, ensure_ascii=False)
+        return dumps(out)
     except Exception as ex:
         return f"Error: failed to serialize result to JSON. {str(ex)}"
\ No newline at end of file
@@ -1,9 +1,48 @@
-import requests
+import logging
 import time
 from langchain_core.tools import tool
 
+from .commonUtils import SingleFlight, TTLCache, make_session, warm_up
+
+logger = logging.getLogger(__name__)
+
+_SESSION = make_session(retry=True)
+
+
+# Weather requests currently in flight, by cache key
+_INFLIGHT = SingleFlight()
+
+
+def warmUp():
+    '''
+    Pre-connect to wttr.in in the background. Optional; call once at startup if the host wants the
+    first weather call to skip the handshake.
+    '''
+    return warm_up(_SESSION, "https://wttr.in/")
+
+
+# Successful weather replies by (location, forecast); wttr.in itself only refreshes its data every few minutes
+_RESPONSE_CACHE = TTLCache(maxsize=1024, ttl_s=15 * 60)
+
+
+def _summarizeForecast(location, payload):
+    '''
+    Condense a wttr.in j1 payload (tens of KB) into a few lines: current conditions plus the
+    min/max temperature and midday description for each forecast day.
+    '''
+    current = payload['current_condition'][0]
+    lines = [f"{location}: now {current['weatherDesc'][0]['value'].strip()}, {current['temp_C']}°C "
+             f"(feels like {current['FeelsLikeC']}°C), humidity {current['humidity']}%"]
+    for day in payload.get('weather', [])[:3]:
+        hourly = day.get('hourly') or [{}]
+        # Entries are 3-hourly from 00:00, so index 4 is 12:00
+        midday = hourly[min(4, len(hourly) - 1)]
+        desc = midday.get('weatherDesc', [{}])[0].get('value', '').strip()
+        lines.append(f"{day['date']}: {desc}, {day['mintempC']}-{day['maxtempC']}°C")
+    return "\n".join(lines)
+
 @tool
-def getWeather(location) -> str:
+def getWeather(location, forecast=False) -> str:
     '''
     Retrieves the current or the forecasted weather and temperature for a specified location.(获取特定城市的天气)
     If you cannot find the weather for the specified location, respond with "Sorry, I couldn't find the weather for that location.
@@ -14,22 +53,39 @@ def getWeather(location) -> str:
         forecast (bool): Whether to get the forecasted weather. Default is False.
     
     Returns:
-        str: A summary of the current weather. 
+        str: A summary of the current weather, or with `forecast` the current conditions followed by
+             one line per forecast day (today and the next two days).
     '''
+    # Keyed on the exact location: the reply echoes the location text back
+    key = (location, forecast)
+
     def searchWeather(location,forecast=False):
         try:
             # jsonurl = f"https://wttr.in/{location}?format=j1"#'https://api.open-meteo.com/v1/forecast?latitude=31.2222&longitude=121.4581&current=temperature_2m,relative_humidity_2m'
             # jsonresponse = requests.get(jsonurl)
-            startTime = time.time()
+            startTime = time.perf_counter()
             if forecast:
                 url = f"https://wttr.in/{location}?format=j1"
             else:
                 url = f"https://wttr.in/{location}?format=3"
-            response = requests.get(url,timeout=10)
-            endTime = time.time()
-            diff = endTime - startTime
-            print(f"Request Takes: {diff} 秒") 
-            return response.text
+            response = _SESSION.get(url,timeout=10)
+            logger.debug("wttr.in request for %s took %.3fs", location, time.perf_counter() - startTime)
+            if not response.ok:
+                return response.text
+            text = response.text
+            if forecast:
+                # Hand the model a short summary instead of the raw j1 JSON
+                try:
+                    text = _summarizeForecast(location, response.json())
+                except (ValueError, KeyError, IndexError, TypeError, AttributeError):
+                    pass
+            _RESPONSE_CACHE.put(key, text)
+            return text
         except Exception as e:
             return f'Error happens in searching for weather: {str(e)}'
-    return searchWeather(location)
\ No newline at end of file
+    cached = _RESPONSE_CACHE.get(key)
+    if cached is not None:
+        return cached
+    # Concurrent calls for the same location share one request; the cache is re-checked in case a
+    # previous request finished between the check above and joining
+    return _INFLIGHT.run(key, lambda: _RESPONSE_CACHE.get(key) or searchWeather(location, forecast))
\ No newline at end of file
@@ -1,8 +1,16 @@
+import functools
 from tavily import TavilyClient
 from config.settings import settings
 from langchain_core.tools import tool
 
 
+@functools.lru_cache(maxsize=1)
+def getTavilyClient() -> TavilyClient:
+    '''
+    One shared client per process so its HTTP connection pool is reused across searches.
+    newsTools uses it too.
+    '''
+    return TavilyClient(api_key=settings.tavilyApiKey)
 
 @tool
 def basicWebSearch(query) -> str:
@@ -15,6 +23,6 @@ def basicWebSearch(query) -> str:
     Returns:
         str: The most relevant information from the web.
     '''
-    tavily_client = TavilyClient(api_key=settings.tavilyApiKey)
+    tavily_client = getTavilyClient()
     response = tavily_client.search(query,max_results=5)
-    return response
\ No newline at end of file
+    return response
@@ -2,14 +2,17 @@
 
 from __future__ import annotations
 
-import json
-from typing import Any, Dict, List, Optional, Tuple
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-import requests
 from langchain_core.tools import tool
 
 from config.settings import settings
 
+from .commonUtils import SingleFlight, TTLCache, dumps, loads, make_session, warm_up as _warm_up
+
 
 # Common indicator presets (World Bank indicator codes)
 _INDICATOR_PRESETS: Dict[str, str] = {
@@ -49,28 +52,73 @@ def _get_base_url() -> str:
     return "https://api.worldbank.org"
 
 
+_SESSION = make_session(
+    {
+        "User-Agent": "corque-plugin/1.0 (WorldBank tool)",
+        "Accept": "application/json",
+    },
+    retry=True,
+)
+
+
+def warm_up() -> threading.Thread:
+    """
+    Pre-connect to the World Bank API in the background. Optional; call once at startup if the host wants
+    the first tool call to skip the handshake.
+    """
+    return _warm_up(_SESSION, f"{_get_base_url()}/v2/country", {"format": "json", "per_page": 1})
+
+
+# Successful tool results by query arguments; indicators are published yearly, so a day is conservative
+_RESPONSE_CACHE = TTLCache(maxsize=1024, ttl_s=24 * 60 * 60)
+
+
+# Queries currently being fetched, by cache key, so concurrent identical calls wait for one result
+# instead of each sending their own requests
+_INFLIGHT = SingleFlight()
+
+
 def _request_json(url: str, params: Dict[str, Any], timeout_s: int) -> Tuple[Optional[Any], Optional[str]]:
     """
     Internal helper for GET requests that returns (json_data, error_message).
     Never raises to caller.
     """
-    headers = {
-        "User-Agent": "corque-plugin/1.0 (WorldBank tool)",
-        "Accept": "application/json",
-    }
+    data, _, _, err = _request_json_conditional(url, params, timeout_s, {})
+    return data, err
+
+
+def _request_json_conditional(
+    url: str, params: Dict[str, Any], timeout_s: int, validators: Dict[str, str]
+) -> Tuple[Optional[Any], Dict[str, str], bool, Optional[str]]:
+    """
+    GET that sends `validators` (If-None-Match / If-Modified-Since request headers) and returns
+    (json_data, validators_for_next_time, not_modified, error_message). On a 304 the previous validators
+    are returned with not_modified=True and no data. Never raises to caller.
+    """
     try:
-        resp = requests.get(url, params=params, headers=headers, timeout=timeout_s)
+        resp = _SESSION.get(url, params=params, headers=validators, timeout=timeout_s)
     except Exception as e:
-        return None, f"request error: {str(e)}"
+        return None, {}, False, f"request error: {str(e)}"
+
+    if resp.status_code == 304 and validators:
+        return None, validators, True, None
 
     if resp.status_code != 200:
         text = resp.text or ""
-        return None, f"http {resp.status_code}: {text[:300]}"
+        return None, {}, False, f"http {resp.status_code}: {text[:300]}"
+
+    next_validators: Dict[str, str] = {}
+    etag = resp.headers.get("ETag")
+    if etag:
+        next_validators["If-None-Match"] = etag
+    last_modified = resp.headers.get("Last-Modified")
+    if last_modified:
+        next_validators["If-Modified-Since"] = last_modified
 
     try:
-        return resp.json(), None
+        return loads(resp.content), next_validators, False, None
     except Exception:
-        return None, "failed to parse json response"
+        return None, {}, False, "failed to parse json response"
 
 
 def _normalize_country_code(country: str) -> str:
@@ -84,75 +132,171 @@ def _normalize_country_code(country: str) -> str:
     return c
 
 
-def _resolve_country_to_iso2(base_url: str, country_input: str, timeout_s: int) -> Tuple[Optional[str], Optional[str]]:
+# Common names that neither equal nor are contained in the World Bank's official country names
+# (e.g. "Korea, Rep.", "Viet Nam", "Turkiye"). Checked before the country list is needed at all.
+_COUNTRY_ALIASES: Dict[str, str] = {
+    "usa": "us",
+    "america": "us",
+    "united states of america": "us",
+    "britain": "gb",
+    "great britain": "gb",
+    "england": "gb",
+    "south korea": "kr",
+    "north korea": "kp",
+    "vietnam": "vn",
+    "laos": "la",
+    "czech republic": "cz",
+    "turkey": "tr",
+    "slovakia": "sk",
+    "kyrgyzstan": "kg",
+    "ivory coast": "ci",
+    "cape verde": "cv",
+    "swaziland": "sz",
+    "dr congo": "cd",
+    "democratic republic of the congo": "cd",
+    "republic of the congo": "cg",
+    "macau": "mo",
+    "brunei": "bn",
+}
+
+# Country-name index per base URL: (expires_at, {name_lower: iso2}, [(name_lower, iso2), ...] shortest first,
+# validators). The country list changes a few times a year, so it is fetched at most once a day instead of on
+# every non-ISO2 lookup. Once expired it is revalidated with the ETag / Last-Modified of the last download
+# (`validators`), and a 304 reply keeps the index for another day without transferring or parsing the list.
+# Failed fetches are not cached.
+_COUNTRY_INDEX: Dict[str, Tuple[float, Dict[str, str], List[Tuple[str, str]], Dict[str, str]]] = {}
+_COUNTRY_INDEX_TTL_S = 24 * 60 * 60
+_COUNTRY_INDEX_LOCK = threading.Lock()
+
+
+def _get_country_index(
+    base_url: str, timeout_s: int
+) -> Tuple[Optional[Tuple[Dict[str, str], List[Tuple[str, str]]]], Optional[str]]:
     """
-    Resolve a country name/alias to ISO2 code by scanning World Bank country list.
-    Returns (iso2, error). Never raises.
+    Return the (exact-name map, ordered name list) for the World Bank country list, fetching it if needed.
+    Returns (index, error). Never raises.
     """
-    # If already ISO2, accept as-is
-    c = country_input.strip()
-    if len(c) == 2 and c.isalpha():
-        return c.lower(), None
+    with _COUNTRY_INDEX_LOCK:
+        entry = _COUNTRY_INDEX.get(base_url)
+    if entry is not None and entry[0] > time.monotonic():
+        return (entry[1], entry[2]), None
 
-    # World Bank countries list is paginated; we fetch up to 400 per page.
-    # This is still lightweight enough for a tool call.
+    # World Bank countries list is paginated; we fetch up to 400 per page, which today covers
+    # every country in one request.
     url = f"{base_url}/v2/country"
-    params = {"format": "json", "per_page": 400, "page": 1}
 
-    data, err = _request_json(url, params=params, timeout_s=timeout_s)
+    def check_page(data: Any, err: Optional[str]) -> Tuple[Optional[List[Any]], Optional[str]]:
+        if err:
+            return None, f"failed to fetch country list: {err}"
+        # Response shape: [metadata, [countryObj...]]
+        if not isinstance(data, list) or len(data) < 2 or not isinstance(data[1], list):
+            return None, "unexpected country list response format"
+        return data, None
+
+    def fetch_page(page: int) -> Tuple[Optional[List[Any]], Optional[str]]:
+        return check_page(
+            *_request_json(url, params={"format": "json", "per_page": 400, "page": page}, timeout_s=timeout_s)
+        )
+
+    # Page 1 carries the validators for the whole list
+    data, validators, not_modified, err = _request_json_conditional(
+        url, {"format": "json", "per_page": 400, "page": 1}, timeout_s, entry[3] if entry is not None else {}
+    )
+    if not_modified:
+        with _COUNTRY_INDEX_LOCK:
+            _COUNTRY_INDEX[base_url] = (time.monotonic() + _COUNTRY_INDEX_TTL_S, entry[1], entry[2], entry[3])
+        return (entry[1], entry[2]), None
+    first, err = check_page(data, err)
     if err:
-        return None, f"failed to fetch country list: {err}"
-
-    # Response shape: [metadata, [countryObj...]]
-    if not isinstance(data, list) or len(data) < 2 or not isinstance(data[1], list):
-        return None, "unexpected country list response format"
-
-    target = country_input.strip().lower()
-    # Try exact match on name first, then substring
-    exact_candidates: List[Dict[str, Any]] = []
-    partial_candidates: List[Dict[str, Any]] = []
+        return None, err
+    items: List[Any] = list(first[1])
 
-    for item in data[1]:
+    # Should the list ever outgrow one page, fetch the remaining pages concurrently rather than one by one
+    # (the metadata mixes ints and numeric strings, e.g. "per_page": "400")
+    try:
+        pages = int(first[0].get("pages", 1)) if isinstance(first[0], dict) else 1
+    except (TypeError, ValueError):
+        pages = 1
+    if pages > 1:
+        with ThreadPoolExecutor(max_workers=min(8, pages - 1)) as executor:
+            rest = list(executor.map(fetch_page, range(2, pages + 1)))
+        for data, err in rest:
+            if err:
+                return None, err
+            items.extend(data[1])
+
+    exact: Dict[str, str] = {}
+    names: List[Tuple[str, str]] = []
+    for item in items:
         if not isinstance(item, dict):
             continue
         name = str(item.get("name", "")).strip()
         iso2 = str(item.get("iso2Code", "")).strip().lower()
         if not name or not iso2:
             continue
-
         name_l = name.lower()
-        if name_l == target:
-            exact_candidates.append(item)
-        elif target in name_l:
-            partial_candidates.append(item)
+        # Keep the first country for a duplicated name, as the list scan did
+        exact.setdefault(name_l, iso2)
+        names.append((name_l, iso2))
+    # For substring matches prefer the shortest name, the one closest to the input
+    # (e.g. "korea" -> "Korea, Rep."); the sort is stable, so ties keep API order
+    names.sort(key=lambda pair: len(pair[0]))
 
-    chosen = (exact_candidates or partial_candidates)
-    if not chosen:
-        return None, f"country not found for input='{country_input}'"
+    with _COUNTRY_INDEX_LOCK:
+        _COUNTRY_INDEX[base_url] = (time.monotonic() + _COUNTRY_INDEX_TTL_S, exact, names, validators)
+    return (exact, names), None
+
+
+def _resolve_country_to_iso2(base_url: str, country_input: str, timeout_s: int) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Resolve a country name/alias to ISO2 code using the cached World Bank country list.
+    Returns (iso2, error). Never raises.
+    """
+    # If already ISO2, accept as-is
+    c = country_input.strip()
+    if len(c) == 2 and c.isalpha():
+        return c.lower(), None
+
+    target = c.lower()
+    iso2 = _COUNTRY_ALIASES.get(target)
+    if iso2 is not None:
+        return iso2, None
 
-    # Choose the first match; return its ISO2
-    iso2 = str(chosen[0].get("iso2Code", "")).strip().lower()
-    if not iso2:
-        return None, "matched country missing iso2Code"
+    index, err = _get_country_index(base_url, timeout_s)
+    if err:
+        return None, err
+    exact, names = index
+
+    # Try exact match on name first, then the shortest name containing the input
+    iso2 = exact.get(target)
+    if iso2 is None:
+        iso2 = next((candidate for name_l, candidate in names if target in name_l), None)
+    if iso2 is None:
+        return None, f"country not found for input='{country_input}'"
     return iso2, None
 
 
-def _pick_indicator_code(indicator: str) -> str:
+def _pick_indicator_code(indicator: str) -> Tuple[str, bool]:
     """
     Map human-friendly indicator names to World Bank indicator codes.
     If user passes a code like 'SP.POP.TOTL', keep it.
+    Returns (code, matched_preset); matched_preset is True when a preset name was mapped.
     """
     s = indicator.strip()
     if not s:
-        return _INDICATOR_PRESETS["population"]
-    key = s.lower().replace(" ", "_")
-    return _INDICATOR_PRESETS.get(key, s)
+        return _INDICATOR_PRESETS["population"], False
+    code = _INDICATOR_PRESETS.get(s.lower().replace(" ", "_"))
+    if code is None:
+        return s, False
+    return code, True
 
 
-def _extract_series(json_payload: Any) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+def _extract_series(json_payload: Any, latest_only: bool = False) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
     """
     Extract time series from World Bank indicator response.
     Response shape: [metadata, [ {date, value, country, indicator, ...}, ... ]]
+    With latest_only, returns only the "latest" point (newest non-null value, else the first point)
+    instead of the "data"/"data_asc" lists.
     Returns (parsed, error). Never raises.
     """
     if not isinstance(json_payload, list) or len(json_payload) < 2 or not isinstance(json_payload[1], list):
@@ -174,6 +318,31 @@ def _extract_series(json_payload: Any) -> Tuple[Optional[Dict[str, Any]], Option
     indicator_name = str(indicator_obj.get("value", "")).strip()
     indicator_id = str(indicator_obj.get("id", "")).strip()
 
+    parsed: Dict[str, Any] = {
+        "country_name": country_name or None,
+        "indicator_name": indicator_name or None,
+        "indicator_code": indicator_id or indicator_id,
+    }
+
+    if latest_only:
+        # Rows are typically newest-first: stop at the first non-null value instead of
+        # building every point and sorting them
+        first_point: Optional[Dict[str, Any]] = None
+        for r in rows:
+            try:
+                year = int(str(r.get("date", "")).strip())
+            except Exception:
+                continue
+            value = r.get("value", None)
+            if value is not None:
+                parsed["latest"] = {"year": year, "value": value}
+                return parsed, None
+            if first_point is None:
+                first_point = {"year": year, "value": value}
+        # No non-null value found; pick first anyway
+        parsed["latest"] = first_point
+        return parsed, None
+
     # Build datapoints: year(int), value(number|None)
     points: List[Dict[str, Any]] = []
     for r in rows:
@@ -188,19 +357,200 @@ def _extract_series(json_payload: Any) -> Tuple[Optional[Dict[str, Any]], Option
     # Points usually come newest->oldest; keep as-is but also provide sorted_asc
     points_asc = sorted(points, key=lambda x: x["year"])
 
-    return {
-        "country_name": country_name or None,
-        "indicator_name": indicator_name or None,
-        "indicator_code": indicator_id or indicator_id,
-        "data": points,
-        "data_asc": points_asc,
-    }, None
+    parsed["data"] = points
+    parsed["data_asc"] = points_asc
+    return parsed, None
+
+
+def _payload_country_iso2(json_payload: Any) -> Optional[str]:
+    """
+    Return the lowercased ISO2 code of the country in an indicator response, or None if it has no data rows
+    (e.g. the API rejected the country code with a {"message": ...} payload).
+    """
+    if not isinstance(json_payload, list) or len(json_payload) < 2 or not isinstance(json_payload[1], list):
+        return None
+    for r in json_payload[1]:
+        if isinstance(r, dict) and isinstance(r.get("country"), dict):
+            code = str(r["country"].get("id", "")).strip().lower()
+            if code:
+                return code
+    return None
+
+
+def _group_rows_by_indicator(json_payload: Any) -> Tuple[Optional[Dict[str, List[Any]]], Optional[str]]:
+    """
+    Split a multi-indicator response into per-indicator payloads keyed by upper-cased indicator id,
+    each shaped like a single-indicator response ([metadata, rows]) so _extract_series can parse it.
+    Returns (grouped, error). Never raises.
+    """
+    if not isinstance(json_payload, list) or len(json_payload) < 2 or not isinstance(json_payload[1], list):
+        if isinstance(json_payload, dict) and "message" in json_payload:
+            return None, f"api message: {json_payload.get('message')}"
+        return None, "unexpected indicator response format"
+
+    grouped: Dict[str, List[Any]] = {}
+    for r in json_payload[1]:
+        if not isinstance(r, dict):
+            continue
+        indicator_obj = r.get("indicator", {}) if isinstance(r.get("indicator"), dict) else {}
+        indicator_id = str(indicator_obj.get("id", "")).strip().upper()
+        grouped.setdefault(indicator_id, [json_payload[0], []])[1].append(r)
+    return grouped, None
+
+
+def _summarize_series(
+    series: Dict[str, Any], indicator_code: str, latest_only: bool, warnings: List[str], multi: bool = False
+) -> Dict[str, Any]:
+    """
+    Build the per-indicator result dict (latest point or ascending series) from a series extracted
+    with the same latest_only flag. With multi, warnings name the indicator they refer to.
+    """
+    result: Dict[str, Any] = {
+        "country_name": series.get("country_name"),
+        "indicator_name": series.get("indicator_name"),
+        "indicator_code": indicator_code,
+    }
+
+    if latest_only:
+        latest_point = series.get("latest")
+        result["latest"] = latest_point
+        if latest_point is None:
+            warning = "No datapoint with a non-null value was found in the requested range."
+            warnings.append(f"indicator '{indicator_code}': {warning}" if multi else warning)
+    else:
+        result["series"] = series.get("data_asc")
+    return result
+
+
+def _query_country_stats(
+    base_url: str,
+    country: str,
+    indicator_inputs: List[str],
+    picked: List[Tuple[str, bool]],
+    multi: bool,
+    start_year: Optional[int],
+    end_year: Optional[int],
+    latest_only: bool,
+    timeout_s: int,
+    cache_key: Tuple[Any, ...],
+) -> str:
+    """
+    Fetch and format the stats for already-validated get_worldbank_country_stats arguments, with the
+    indicators already stripped (indicator_inputs) and resolved (picked, as (code, matched_preset) pairs),
+    caching a successful result under cache_key. Returns the tool's JSON string or an "Error: ..." string.
+    """
+    warnings: List[str] = []
+    indicator_codes = [code for code, _ in picked]
+
+    # Build indicator request; several indicators go in one path joined by ';', which the API
+    # only accepts together with a source (2 = World Development Indicators)
+    indicator_path = ";".join(indicator_codes)
+    params: Dict[str, Any] = {"format": "json"}
+    if multi:
+        params["source"] = 2
+
+    # Date range handling. A range returns at most one row per year and indicator, so the page is sized
+    # to fit exactly; without a range, 200 rows per indicator covers every year since 1960.
+    years_per_indicator = 200
+    if start_year is not None and end_year is None:
+        params["date"] = f"{start_year}:{start_year}"
+        years_per_indicator = 1
+    elif start_year is not None and end_year is not None:
+        params["date"] = f"{start_year}:{end_year}"
+        years_per_indicator = end_year - start_year + 1
+    params["per_page"] = years_per_indicator * len(indicator_codes)
+
+    # Resolve country to ISO2 if needed
+    country_norm = _normalize_country_code(country)
+    iso2: Optional[str] = None
+    payload: Any = None
+    if len(country_norm) == 2 and country_norm.isalpha():
+        iso2 = country_norm.lower()
+    elif len(country_norm) == 3 and country_norm.isalpha():
+        # Most likely an ISO3 code, which the indicator endpoint accepts directly. Request the data with it
+        # while the name lookup runs alongside, and only fall back to the lookup if the API has no such country.
+        # The executor is not used as a context manager: its exit would wait for the lookup even when the
+        # ISO3 request succeeds. Shutting down without waiting lets the lookup finish in the background and
+        # warm the country index.
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            resolving = executor.submit(_resolve_country_to_iso2, base_url, country_norm, timeout_s)
+            speculative, err = _request_json(
+                f"{base_url}/v2/country/{country_norm}/indicator/{indicator_path}", params=params, timeout_s=timeout_s
+            )
+            iso2 = None if err else _payload_country_iso2(speculative)
+            if iso2 is not None:
+                payload = speculative
+            else:
+                iso2, err = resolving.result()
+                if err:
+                    return f"Error: {err}"
+                warnings.append("country input resolved via World Bank country list; verify if multiple matches are possible.")
+        finally:
+            executor.shutdown(wait=False)
+    else:
+        iso2, err = _resolve_country_to_iso2(base_url, country_norm, timeout_s=timeout_s)
+        if err:
+            return f"Error: {err}"
+        warnings.append("country input resolved via World Bank country list; verify if multiple matches are possible.")
+
+    for ind, (indicator_code, matched_preset) in zip(indicator_inputs, picked):
+        if matched_preset:
+            warnings.append(f"indicator preset '{ind}' mapped to World Bank code '{indicator_code}'.")
+
+    # Fetch data (unless the ISO3 request above already returned it)
+    if payload is None:
+        url = f"{base_url}/v2/country/{iso2}/indicator/{indicator_path}"
+        payload, err = _request_json(url, params=params, timeout_s=timeout_s)
+        if err:
+            return f"Error: failed to fetch World Bank data. {err}"
+
+    result: Dict[str, Any]
+    if not multi:
+        series, err2 = _extract_series(payload, latest_only)
+        if err2:
+            return f"Error: failed to parse World Bank data. {err2}"
+        result = _summarize_series(series, indicator_codes[0], latest_only, warnings)
+    else:
+        grouped, err2 = _group_rows_by_indicator(payload)
+        if err2:
+            return f"Error: failed to parse World Bank data. {err2}"
+        result = {}
+        for indicator_code in indicator_codes:
+            series, err3 = _extract_series(grouped.get(indicator_code.upper(), [None, []]), latest_only)
+            if err3:
+                warnings.append(f"indicator '{indicator_code}': {err3}")
+                result[indicator_code] = None
+                continue
+            result[indicator_code] = _summarize_series(series, indicator_code, latest_only, warnings, multi=True)
+
+    out = {
+        "query": {
+            "country_input": country.strip(),
+            "country_iso2": iso2,
+            "indicator_input": indicator_inputs if multi else indicator_inputs[0],
+            "indicator_code": indicator_codes if multi else indicator_codes[0],
+            "start_year": start_year,
+            "end_year": end_year,
+            "latest_only": latest_only,
+            "base_url": base_url,
+        },
+        "result": result,
+        "warnings": warnings,
+    }
+
+    try:
+        result_json = dumps(out)
+    except Exception as e:
+        return f"Error: failed to serialize result to JSON. {str(e)}"
+    _RESPONSE_CACHE.put(cache_key, result_json)
+    return result_json
 
 
 @tool
 def get_worldbank_country_stats(
     country: str,
-    indicator: str = "population",
+    indicator: Union[str, List[str]] = "population",
     start_year: Optional[int] = None,
     end_year: Optional[int] = None,
     latest_only: bool = True,
@@ -212,8 +562,9 @@ def get_worldbank_country_stats(
 
     Args:
         country (str): Required. Country ISO2/ISO3 code (e.g., "US", "CHN") or country name (e.g., "United States", "China").
-        indicator (str): Optional. Indicator preset name (e.g., "population", "gdp_current_usd", "life_expectancy")
-            or a World Bank indicator code (e.g., "SP.POP.TOTL"). Default is "population".
+        indicator (Union[str, List[str]]): Optional. Indicator preset name (e.g., "population", "gdp_current_usd",
+            "life_expectancy") or a World Bank indicator code (e.g., "SP.POP.TOTL"). Default is "population".
+            Pass a list (up to 10) to fetch several World Development Indicators for the country in one request.
         start_year (Optional[int]): Optional. Start year (e.g., 2000). If provided with end_year, queries a range.
         end_year (Optional[int]): Optional. End year (e.g., 2023). If omitted while start_year provided, uses start_year only.
         latest_only (bool): Optional. If True, returns only the latest available datapoint in the requested range. Default True.
@@ -222,7 +573,8 @@ def get_worldbank_country_stats(
     Returns:
         str: A JSON string that can be parsed by json.loads, with keys:
             - query: resolved country/indicator and parameters
-            - result: {country_name, indicator_name, indicator_code, latest?, series?}
+            - result: {country_name, indicator_name, indicator_code, latest?, series?}; when `indicator` is a list,
+              a dict keyed by indicator code with one such object (or null if no data) per indicator
             - warnings: list of non-fatal notes
         On failure, returns an error string starting with "Error:".
     """
@@ -230,8 +582,17 @@ def get_worldbank_country_stats(
     if not isinstance(country, str) or not country.strip():
         return "Error: country parameter cannot be empty."
 
-    if not isinstance(indicator, str):
-        return "Error: indicator must be a string."
+    if isinstance(indicator, str):
+        indicators = [indicator]
+    elif (
+        isinstance(indicator, list)
+        and 1 <= len(indicator) <= 10
+        and all(isinstance(i, str) and i.strip() for i in indicator)
+    ):
+        indicators = indicator
+    else:
+        return "Error: indicator must be a string or a list of 1 to 10 non-empty strings."
+    multi = not isinstance(indicator, str)
 
     if start_year is not None and (not isinstance(start_year, int) or start_year < 1900 or start_year > 2100):
         return "Error: start_year must be an integer between 1900 and 2100."
@@ -247,84 +608,27 @@ def get_worldbank_country_stats(
         return "Error: timeout_s must be an integer between 3 and 30."
 
     base_url = _get_base_url()
-    warnings: List[str] = []
 
-    # Resolve country to ISO2 if needed
-    country_norm = _normalize_country_code(country)
-    iso2: Optional[str] = None
-    if len(country_norm) == 2 and country_norm.isalpha():
-        iso2 = country_norm.lower()
-    else:
-        iso2, err = _resolve_country_to_iso2(base_url, country_norm, timeout_s=timeout_s)
-        if err:
-            return f"Error: {err}"
-        warnings.append("country input resolved via World Bank country list; verify if multiple matches are possible.")
-
-    # Resolve indicator code
-    indicator_code = _pick_indicator_code(indicator)
-    if indicator_code != indicator.strip() and indicator.strip().lower().replace(" ", "_") in _INDICATOR_PRESETS:
-        warnings.append(f"indicator preset '{indicator}' mapped to World Bank code '{indicator_code}'.")
-
-    # Build indicator request
-    url = f"{base_url}/v2/country/{iso2}/indicator/{indicator_code}"
-    params: Dict[str, Any] = {"format": "json", "per_page": 200}
-
-    # Date range handling
-    if start_year is not None and end_year is None:
-        params["date"] = f"{start_year}:{start_year}"
-    elif start_year is not None and end_year is not None:
-        params["date"] = f"{start_year}:{end_year}"
-
-    # Fetch data
-    payload, err = _request_json(url, params=params, timeout_s=timeout_s)
-    if err:
-        return f"Error: failed to fetch World Bank data. {err}"
-
-    series, err2 = _extract_series(payload)
-    if err2:
-        return f"Error: failed to parse World Bank data. {err2}"
-
-    # Compose output
-    data_points = series.get("data", []) if isinstance(series, dict) else []
-    latest_point = None
-    for p in data_points:
-        # API is typically newest-first; pick first with non-null value
-        if isinstance(p, dict) and p.get("value", None) is not None:
-            latest_point = p
-            break
-    if latest_point is None and data_points:
-        # No non-null value found; pick first anyway
-        latest_point = data_points[0]
-
-    result: Dict[str, Any] = {
-        "country_name": series.get("country_name"),
-        "indicator_name": series.get("indicator_name"),
-        "indicator_code": indicator_code,
-    }
+    # Resolve indicator codes once; the cache key and the request both use them
+    indicator_inputs = [i.strip() for i in indicators]
+    picked = [_pick_indicator_code(i) for i in indicator_inputs]
+    indicator_codes = [code for code, _ in picked]
 
-    if latest_only:
-        result["latest"] = latest_point
-        if latest_point is None:
-            warnings.append("No datapoint with a non-null value was found in the requested range.")
-    else:
-        result["series"] = series.get("data_asc")
-
-    out = {
-        "query": {
-            "country_input": country.strip(),
-            "country_iso2": iso2,
-            "indicator_input": indicator.strip(),
-            "indicator_code": indicator_code,
-            "start_year": start_year,
-            "end_year": end_year,
-            "latest_only": latest_only,
-            "base_url": base_url,
-        },
-        "result": result,
-        "warnings": warnings,
-    }
-
-    try:
-        return json.dumps(out, ensure_ascii=False)
-    except Exception as e:
-        return f"Error: failed to serialize result to JSON. {str(e)}"
\ No newline at end of file
+    # Identical queries within the TTL return the previous result without any request. Country resolution
+    # ignores case, so the key does too.
+    cache_key = (
+        base_url, country.strip().casefold(), tuple(indicator_inputs), tuple(indicator_codes), start_year, end_year, latest_only
+    )
+    cached = _RESPONSE_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Concurrent identical queries share one set of requests. The leader re-checks the cache in case
+    # another leader stored the result between the check above and taking the flight.
+    return _INFLIGHT.run(
+        cache_key,
+        lambda: _RESPONSE_CACHE.get(cache_key)
+        or _query_country_stats(
+            base_url, country, indicator_inputs, picked, multi, start_year, end_year, latest_only, timeout_s, cache_key
+        ),
+    )